@@ -1,10 +1,205 @@
 import yaml
 import os
+import sys
+import mmap
+import logging
 import random
+import hashlib
+import pickle
+import functools
+import concurrent.futures
+from collections import defaultdict
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import glob
 
+# Use the libyaml C loader when available - it parses 5-15x faster than the
+# pure-Python SafeLoader, which dominates cold-start time across many files.
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+# Optional: pyahocorasick lets search_many() answer many keyword queries
+# in one linear scan per corpus instead of one scan per query.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional: orjson serializes attack payloads several times faster than
+# stdlib json on the per-attack reporting path.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Below this many files a worker pool costs more to spin up than it saves.
+_PARALLEL_THRESHOLD = 32
+
+# On-disk cache of parsed attacks; the corpora rarely change, so warm
+# starts skip the full YAML parse and just deserialize one pickle.
+_CACHE_DIR = Path(os.path.expanduser("~/.cache/redbot"))
+
+# Files above this size are memory-mapped instead of copied into a bytes
+# object; below it mmap's setup cost outweighs the saved memcpy.
+_MMAP_THRESHOLD = 65536
+
+def _load_yaml_file(yaml_file: Path):
+    """Parse one YAML file, memory-mapping large ones for zero-copy reads."""
+    if yaml_file.stat().st_size > _MMAP_THRESHOLD:
+        with open(yaml_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return yaml.load(mm, Loader=_Loader)
+    # Single read() of raw bytes; no TextIOWrapper decode pass, and
+    # libyaml handles UTF-8 input directly.
+    return yaml.load(yaml_file.read_bytes(), Loader=_Loader)
+
+@functools.lru_cache(maxsize=None)
+def _category_prefix(parent_parts: Tuple[str, ...]) -> Optional[str]:
+    """Fully-joined category prefix for a directory, memoized.
+
+    The layout branches (pliny vs generic, depth check) are evaluated
+    once per directory here; every subsequent file in that directory
+    gets the pre-joined prefix string back. None means the file sits
+    too close to the root ('general').
+    """
+    if len(parent_parts) < 2:
+        return None
+    if 'pliny' in parent_parts:
+        # Provider/model path under the pliny tree
+        return '/'.join(('pliny',) + parent_parts[parent_parts.index('pliny') + 1:])
+    return parent_parts[-1]
+
+def _extract_category(file_path: Path) -> str:
+    """Extract category from file path."""
+    prefix = _category_prefix(file_path.parent.parts)
+    if prefix is None:
+        return 'general'
+    return prefix + '/' + file_path.name
+
+def _parse_jailbreak_file(path: str) -> Tuple[str, Optional[Dict], Optional[str]]:
+    """Worker: parse one jailbreak YAML into a structured attack dict."""
+    yaml_file = Path(path)
+    try:
+        data = _load_yaml_file(yaml_file)
+        if not data or 'name' not in data:
+            return (path, None, None)
+        attack_name = data['name']
+        attack = {
+            'name': attack_name,
+            'description': data.get('description', ''),
+            'authors': data.get('authors') or (),
+            'source': data.get('source', ''),
+            'parameters': data.get('parameters') or (),
+            'template': data.get('value', ''),
+            'category': _extract_category(yaml_file),
+            'file_path': str(yaml_file),
+            'data_type': data.get('data_type', 'text')
+        }
+        return (path, attack, None)
+    except Exception as e:
+        return (path, None, str(e))
+
+def _parse_seed_yaml_file(path: str) -> Tuple[str, Optional[Dict], Optional[str]]:
+    """Worker: parse one seed prompt YAML into a structured attack dict."""
+    yaml_file = Path(path)
+    try:
+        data = _load_yaml_file(yaml_file)
+        if not data:
+            return (path, None, None)
+        attack_name = data.get('name', data.get('dataset_name', yaml_file.stem))
+        harm_categories = data.get('harm_categories') or ()
+
+        # Extract prompts
+        prompts = []
+        if 'prompts' in data:
+            for prompt_item in data['prompts']:
+                if isinstance(prompt_item, dict) and 'value' in prompt_item:
+                    prompts.append(prompt_item['value'])
+                elif isinstance(prompt_item, str):
+                    prompts.append(prompt_item)
+
+        attack = {
+            'name': attack_name,
+            'description': data.get('description', ''),
+            'authors': data.get('authors') or (),
+            'source': data.get('source', ''),
+            'harm_categories': harm_categories,
+            'prompts': prompts,
+            'category': _extract_category(yaml_file),
+            'file_path': str(yaml_file),
+            'groups': data.get('groups') or ()
+        }
+        return (path, attack, None)
+    except Exception as e:
+        return (path, None, str(e))
+
+def _parse_prompt_file(path: str) -> Tuple[str, Optional[Dict], Optional[str]]:
+    """Worker: wrap one raw .prompt file as a single-prompt seed attack."""
+    prompt_file = Path(path)
+    try:
+        content = prompt_file.read_bytes().decode('utf-8').strip()
+        attack = {
+            'name': prompt_file.stem,
+            'description': f"Direct prompt from {prompt_file.name}",
+            'prompts': [content],
+            'category': _extract_category(prompt_file),
+            'file_path': str(prompt_file),
+            'harm_categories': ('custom',),
+            'authors': (),
+            'source': str(prompt_file)
+        }
+        return (path, attack, None)
+    except Exception as e:
+        return (path, None, str(e))
+
+def _iter_files(root, suffix: str):
+    """Yield paths (as strings) under root whose names end with suffix.
+
+    os.scandir-based replacement for Path.rglob: dirent type info comes
+    back cached from the directory read, so no Path object or extra
+    stat() is paid per entry.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(suffix):
+                        yield entry.path
+        except OSError:
+            continue
+
+def _map_parallel(worker, paths: List[str]):
+    """Map a parse worker over file paths, fanning out across cores.
+
+    YAML parsing of independent files parallelizes cleanly across
+    processes; small batches stay serial since pool startup would
+    dominate. Falls back to serial mapping if the pool can't start.
+    """
+    if len(paths) >= _PARALLEL_THRESHOLD:
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                return list(executor.map(worker, paths, chunksize=16))
+        except (OSError, ValueError):
+            pass
+    # Small batches (or no process pool): keep several reads in flight
+    # with a few threads - file I/O releases the GIL, so cold-cache
+    # reads overlap instead of waiting on the disk one file at a time.
+    if len(paths) > 4:
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+                return list(executor.map(worker, paths))
+        except (OSError, ValueError):
+            pass
+    return map(worker, paths)
+
 class AttackLoader:
     """Load and manage jailbreak and seed prompt attack methods."""
     
@@ -13,108 +208,236 @@ class AttackLoader:
         self.seed_prompts_dir = Path(seed_prompts_dir)
         self.jailbreak_attacks = {}
         self.seed_attacks = {}
+        self._errors: List[Tuple[str, str]] = []
+        # Dedicated generator: batched sampling without touching the
+        # global random state, reproducible via REDBOT_SEED.
+        self._rng = random.Random(int(os.getenv('REDBOT_SEED', '0')) or None)
         self._load_attacks()
     
     def _load_attacks(self):
         """Load all attack methods from YAML files."""
-        # Load jailbreak attacks
+        self._init_indexes()
+        self._seeds_loaded = False
+        self._errors_reported = 0
+
+        # Warm start: reuse the cached parse if the corpora are unchanged
+        self._cache_path = self._cache_file()
+        if self._cache_path and self._load_from_cache(self._cache_path):
+            for name, attack in self.jailbreak_attacks.items():
+                self._index_jailbreak(name, attack)
+            for name, attack in self.seed_attacks.items():
+                self._index_seed(name, attack)
+            self._seeds_loaded = True
+            self._finalize_indexes()
+            return
+
+        # Load jailbreak attacks eagerly; seed loading is deferred until
+        # a seed-touching API is first called, so construction that only
+        # applies jailbreaks never pays for the seed corpus.
         self._load_jailbreak_attacks()
-        # Load seed prompt attacks
+        self._log_errors()
+
+    def _ensure_seeds_loaded(self):
+        """Materialize the seed corpus on first use (cold path only)."""
+        if self._seeds_loaded:
+            return
+        self._seeds_loaded = True
         self._load_seed_attacks()
+        self._log_errors()
+        # Both corpora parsed now - worth persisting for warm starts
+        if self._cache_path:
+            self._save_to_cache(self._cache_path)
+        self._finalize_indexes()
+
+    def _log_errors(self):
+        """Report load failures accumulated since the last call, once.
+
+        A print per bad file would serialize the parallel workers on
+        stdout; a single deferred-format warning does not.
+        """
+        new_errors = self._errors[self._errors_reported:]
+        if new_errors:
+            logger.warning("Failed to load %d attack files: %s",
+                           len(new_errors), new_errors[:5])
+            self._errors_reported = len(self._errors)
+
+    def _init_indexes(self):
+        """Create the empty derived structures filled in during loading.
+
+        Everything derived - category indexes, SoA arrays, search corpus,
+        render closures - is built in the same pass that merges each
+        parsed attack, while its strings are still hot in cache, instead
+        of re-walking the dicts afterwards.
+        """
+        self._jb_by_cat: Dict[str, List[str]] = defaultdict(list)
+        self._seed_by_cat: Dict[str, List[str]] = defaultdict(list)
+
+        # Structure-of-arrays mirrors of the attack dicts: parallel lists
+        # plus a name -> index map. Bulk operations (search, statistics)
+        # scan these flat lists instead of walking a dict per attack.
+        self._jb_names: List[str] = []
+        self._jb_desc: List[str] = []
+        self._jb_tmpl: List[str] = []
+        self._jb_cat: List[str] = []
+        self._jb_index: Dict[str, int] = {}
+        self._seed_names: List[str] = []
+        self._seed_desc: List[str] = []
+        self._seed_prompts: List[List[str]] = []
+        self._seed_cat: List[str] = []
+        self._seed_index: Dict[str, int] = {}
+
+        # One pre-lowercased corpus string per attack so a query is a
+        # single substring scan instead of per-field lower() + compares.
+        self._jb_searchable: List[str] = []
+        self._seed_searchable: List[str] = []
+
+        # Pre-split render closures so apply_jailbreak doesn't rescan the
+        # (potentially multi-KB) template for the placeholder per call.
+        # Closures can't go through the pickle cache, so they're rebuilt
+        # on both the cold and warm paths.
+        self._jb_render: Dict[str, Any] = {}
+
+    def _index_jailbreak(self, name: str, attack: Dict):
+        """Fold one jailbreak attack into every derived structure."""
+        # Intern categories: many attacks share one, and parallel
+        # parsing / cache reload would otherwise duplicate the string.
+        category = attack['category'] = sys.intern(attack['category'])
+        template = attack.get('template', '')
+        searchable = '\x00'.join((name, attack['description'], template)).lower()
+
+        parts = template.split('{{ prompt }}')
+        if len(parts) > 1:
+            self._jb_render[name] = (lambda ps: lambda p: p.join(ps))(parts)
+        else:
+            # No placeholder: append the prompt as a user turn
+            self._jb_render[name] = (lambda t: lambda p: f"{t}\n\nUser: {p}")(template)
+
+        idx = self._jb_index.get(name)
+        if idx is None:
+            self._jb_index[name] = len(self._jb_names)
+            self._jb_names.append(name)
+            self._jb_desc.append(attack['description'])
+            self._jb_tmpl.append(template)
+            self._jb_cat.append(category)
+            self._jb_searchable.append(searchable)
+            self._jb_by_cat[category].append(name)
+        else:
+            # Re-definition (same name from another file): last one wins,
+            # matching dict-merge semantics.
+            if self._jb_cat[idx] != category:
+                self._jb_by_cat[self._jb_cat[idx]].remove(name)
+                self._jb_by_cat[category].append(name)
+            self._jb_desc[idx] = attack['description']
+            self._jb_tmpl[idx] = template
+            self._jb_cat[idx] = category
+            self._jb_searchable[idx] = searchable
+
+    def _index_seed(self, name: str, attack: Dict):
+        """Fold one seed attack into every derived structure."""
+        category = attack['category'] = sys.intern(attack['category'])
+        prompts = attack.get('prompts', [])
+        searchable = '\x00'.join((name, attack['description'], *prompts)).lower()
+
+        idx = self._seed_index.get(name)
+        if idx is None:
+            self._seed_index[name] = len(self._seed_names)
+            self._seed_names.append(name)
+            self._seed_desc.append(attack['description'])
+            self._seed_prompts.append(prompts)
+            self._seed_cat.append(category)
+            self._seed_searchable.append(searchable)
+            self._seed_by_cat[category].append(name)
+        else:
+            if self._seed_cat[idx] != category:
+                self._seed_by_cat[self._seed_cat[idx]].remove(name)
+                self._seed_by_cat[category].append(name)
+            self._seed_desc[idx] = attack['description']
+            self._seed_prompts[idx] = prompts
+            self._seed_cat[idx] = category
+            self._seed_searchable[idx] = searchable
+
+    def _finalize_indexes(self):
+        """Compute load-time statistics once all attacks are indexed."""
+        # Statistics never change after load; compute them here from the
+        # category arrays so get_statistics is a dict copy, not an O(N) pass.
+        jailbreak_categories = set(self._jb_cat)
+        seed_categories = set(self._seed_cat)
+        self._stats: Dict[str, Any] = {
+            'total_jailbreak_attacks': len(self.jailbreak_attacks),
+            'total_seed_attacks': len(self.seed_attacks),
+            'total_attacks': len(self.jailbreak_attacks) + len(self.seed_attacks),
+            'jailbreak_categories': len(jailbreak_categories),
+            'seed_categories': len(seed_categories),
+            'unique_categories': len(jailbreak_categories | seed_categories)
+        }
+
+    def _cache_file(self) -> Optional[Path]:
+        """Cache path keyed by a signature of both attack directories."""
+        try:
+            sig = hashlib.blake2b(digest_size=16)
+            entries = sorted(
+                (str(p), p.stat().st_mtime_ns, p.stat().st_size)
+                for p in chain(self.jailbreak_dir.rglob('*'), self.seed_prompts_dir.rglob('*'))
+                if p.is_file()
+            )
+            for entry in entries:
+                sig.update(repr(entry).encode())
+            return _CACHE_DIR / f"attacks-{sig.hexdigest()}.pkl"
+        except OSError:
+            return None
+
+    def _load_from_cache(self, cache_file: Path) -> bool:
+        """Load parsed attacks from the on-disk cache. Returns True on hit."""
+        try:
+            with open(cache_file, 'rb') as f:
+                self.jailbreak_attacks, self.seed_attacks = pickle.load(f)
+            return True
+        except (OSError, pickle.PickleError, EOFError, ValueError):
+            return False
+
+    def _save_to_cache(self, cache_file: Path):
+        """Persist parsed attacks; best-effort, failures are non-fatal."""
+        try:
+            _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'wb') as f:
+                pickle.dump((self.jailbreak_attacks, self.seed_attacks), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass
     
     def _load_jailbreak_attacks(self):
         """Load jailbreak attacks from YAML files."""
-        for yaml_file in self.jailbreak_dir.rglob("*.yaml"):
-            try:
-                with open(yaml_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                    if data and 'name' in data:
-                        attack_name = data['name']
-                        attack_category = self._extract_category_from_path(yaml_file)
-                        
-                        self.jailbreak_attacks[attack_name] = {
-                            'name': attack_name,
-                            'description':data.get('description', ''),
-                            'authors': data.get('authors', []),
-                            'source': data.get('source', ''),
-                            'parameters': data.get('parameters', []),
-                            'template': data.get('value', ''),
-                            'category': attack_category,
-                            'file_path': str(yaml_file),
-                            'data_type': data.get('data_type', 'text')
-                        }
-            except Exception as e:
-                print(f"Error loading {yaml_file}: {e}")
-    
+        paths = list(_iter_files(self.jailbreak_dir, ".yaml"))
+        for path, attack, error in _map_parallel(_parse_jailbreak_file, paths):
+            if error:
+                self._errors.append((path, error))
+            elif attack:
+                self.jailbreak_attacks[attack['name']] = attack
+                self._index_jailbreak(attack['name'], attack)
+
     def _load_seed_attacks(self):
         """Load seed prompt attacks from YAML and prompt files."""
         # Load YAML files
-        for yaml_file in self.seed_prompts_dir.rglob("*.yaml"):
-            try:
-                with open(yaml_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                    if data:
-                        attack_name = data.get('name', data.get('dataset_name', yaml_file.stem))
-                        harm_categories = data.get('harm_categories', [])
-                        
-                        # Extract prompts
-                        prompts = []
-                        if 'prompts' in data:
-                            for prompt_item in data['prompts']:
-                                if isinstance(prompt_item, dict) and 'value' in prompt_item:
-                                    prompts.append(prompt_item['value'])
-                                elif isinstance(prompt_item, str):
-                                    prompts.append(prompt_item)
-                        
-                        category = self._extract_category_from_path(yaml_file)
-                        
-                        self.seed_attacks[attack_name] = {
-                            'name': attack_name,
-                            'description': data.get('description', ''),
-                            'authors': data.get('authors', []),
-                            'source': data.get('source', ''),
-                            'harm_categories': harm_categories,
-                            'prompts': prompts,
-                            'category': category,
-                            'file_path': str(yaml_file),
-                            'groups': data.get('groups', [])
-                        }
-            except Exception as e:
-                print(f"Error loading {yaml_file}: {e}")
-        
+        paths = list(_iter_files(self.seed_prompts_dir, ".yaml"))
+        for path, attack, error in _map_parallel(_parse_seed_yaml_file, paths):
+            if error:
+                self._errors.append((path, error))
+            elif attack:
+                self.seed_attacks[attack['name']] = attack
+                self._index_seed(attack['name'], attack)
+
         # Load prompt files
-        for prompt_file in self.seed_prompts_dir.rglob("*.prompt"):
-            try:
-                with open(prompt_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    attack_name = prompt_file.stem
-                    category = self._extract_category_from_path(prompt_file)
-                    
-                    self.seed_attacks[attack_name] = {
-                        'name': attack_name,
-                        'description': f"Direct prompt from {prompt_file.name}",
-                        'prompts': [content],
-                        'category': category,
-                        'file_path': str(prompt_file),
-                        'harm_categories': ['custom'],
-                        'authors': [],
-                        'source': str(prompt_file)
-                    }
-            except Exception as e:
-                print(f"Error loading {prompt_file}: {e}")
-    
+        paths = list(_iter_files(self.seed_prompts_dir, ".prompt"))
+        for path, attack, error in _map_parallel(_parse_prompt_file, paths):
+            if error:
+                self._errors.append((path, error))
+            elif attack:
+                self.seed_attacks[attack['name']] = attack
+                self._index_seed(attack['name'], attack)
+
     def _extract_category_from_path(self, file_path: Path) -> str:
         """Extract category from file path."""
-        parts = file_path.parts
-        # Skip the root directories
-        if len(parts) > 2:
-            if 'pliny' in parts:
-                # Extract provider/model from pliny path
-                provider_path = '/'.join(parts[parts.index('pliny')+1:])
-                return f"pliny/{provider_path}"
-            else:
-                return '/'.join(parts[-2:]) if len(parts) > 1 else parts[-1]
-        return 'general'
+        return _extract_category(file_path)
     
     def get_all_jailbreak_attacks(self) -> Dict[str, Dict]:
         """Get all jailbreak attacks."""
@@ -122,6 +445,7 @@ class AttackLoader:
     
     def get_all_seed_attacks(self) -> Dict[str, Dict]:
         """Get all seed prompt attacks."""
+        self._ensure_seeds_loaded()
         return self.seed_attacks
     
     def get_jailbreak_attack(self, name: str) -> Optional[Dict]:
@@ -130,117 +454,115 @@ class AttackLoader:
     
     def get_seed_attack(self, name: str) -> Optional[Dict]:
         """Get a specific seed attack by name."""
+        self._ensure_seeds_loaded()
         return self.seed_attacks.get(name)
     
     def apply_jailbreak(self, attack_name: str, original_prompt: str) -> str:
         """Apply a jailbreak attack to a prompt."""
-        attack = self.get_jailbreak_attack(attack_name)
-        if not attack:
+        render = self._jb_render.get(attack_name)
+        if render is None:
             return original_prompt
-        
-        template = attack['template']
-        # Replace {{ prompt }} placeholder with original prompt
-        if '{{ prompt }}' in template:
-            return template.replace('{{ prompt }}', original_prompt)
-        else:
-            # For attacks without placeholder, append original prompt
-            return f"{template}\n\nUser: {original_prompt}"
+        return render(original_prompt)
     
     def get_random_seed_prompt(self, attack_name: str) -> Optional[str]:
         """Get a random prompt from a seed attack."""
+        prompts = self.get_random_seed_prompts(attack_name, k=1)
+        return prompts[0] if prompts else None
+
+    def get_random_seed_prompts(self, attack_name: str, k: int = 1) -> List[str]:
+        """Sample k prompts (with replacement) from a seed attack in one call.
+
+        Batched sampling amortizes the per-call overhead when the agent
+        queues many attacks per cycle.
+        """
         attack = self.get_seed_attack(attack_name)
         if not attack or not attack['prompts']:
-            return None
-        
-        return random.choice(attack['prompts'])
+            return []
+        return self._rng.choices(attack['prompts'], k=k)
     
     def get_attacks_by_category(self, category: str) -> Dict[str, List[str]]:
         """Get attacks grouped by category."""
-        jailbreak_categories = {}
-        seed_categories = {}
-        
-        # Group jailbreak attacks
-        for name, attack in self.jailbreak_attacks.items():
-            cat = attack['category']
-            if cat not in jailbreak_categories:
-                jailbreak_categories[cat] = []
-            jailbreak_categories[cat].append(name)
-        
-        # Group seed attacks
-        for name, attack in self.seed_attacks.items():
-            cat = attack['category']
-            if cat not in seed_categories:
-                seed_categories[cat] = []
-            seed_categories[cat].append(name)
-        
-        result = {
-            'jailbreak': jailbreak_categories.get(category, []),
-            'seed_prompts': seed_categories.get(category, [])
+        self._ensure_seeds_loaded()
+        return {
+            'jailbreak': self._jb_by_cat.get(category, []),
+            'seed_prompts': self._seed_by_cat.get(category, [])
         }
-        
-        return result
-    
+
     def get_all_categories(self) -> Dict[str, Dict[str, List[str]]]:
         """Get all available categories."""
-        result = {'jailbreak': {}, 'seed_prompts': {}}
-        
-        # Collect jailbreak categories
-        for name, attack in self.jailbreak_attacks.items():
-            cat = attack['category']
-            if cat not in result['jailbreak']:
-                result['jailbreak'][cat] = []
-            result['jailbreak'][cat].append(name)
-        
-        # Collect seed prompt categories
-        for name, attack in self.seed_attacks.items():
-            cat = attack['category']
-            if cat not in result['seed_prompts']:
-                result['seed_prompts'][cat] = []
-            result['seed_prompts'][cat].append(name)
-        
-        return result
+        self._ensure_seeds_loaded()
+        return {
+            'jailbreak': dict(self._jb_by_cat),
+            'seed_prompts': dict(self._seed_by_cat)
+        }
     
     def search_attacks(self, query: str) -> Dict[str, List[str]]:
         """Search for attacks by name, description, or content."""
+        self._ensure_seeds_loaded()
         query_lower = query.lower()
-        jailbreak_matches = []
-        seed_matches = []
-        
-        # Search jailbreak attacks
-        for name, attack in self.jailbreak_attacks.items():
-            if (query_lower in name.lower() or 
-                query_lower in attack['description'].lower() or
-                query_lower in attack.get('template', '').lower()):
-                jailbreak_matches.append(name)
-        
-        # Search seed attacks
-        for name, attack in self.seed_attacks.items():
-            if (query_lower in name.lower() or 
-                query_lower in attack['description'].lower()):
-                # Also search in prompts
-                for prompt in attack.get('prompts', []):
-                    if query_lower in prompt.lower():
-                        seed_matches.append(name)
-                        break
-        
         return {
-            'jailbreak': jailbreak_matches,
-            'seed_prompts': seed_matches
+            'jailbreak': [self._jb_names[i] for i, s in enumerate(self._jb_searchable)
+                          if query_lower in s],
+            'seed_prompts': [self._seed_names[i] for i, s in enumerate(self._seed_searchable)
+                             if query_lower in s]
         }
     
+    def search_many(self, queries: List[str]) -> Dict[str, Dict[str, List[str]]]:
+        """Run several search_attacks queries in one pass.
+
+        With pyahocorasick installed, all queries are matched against
+        each attack corpus in a single automaton scan - O(text + hits)
+        total instead of one substring sweep per query. Without it, this
+        degrades to per-query search_attacks calls.
+        """
+        self._ensure_seeds_loaded()
+        lowered = {query: query.lower() for query in queries}
+        if ahocorasick is None or len(queries) < 2:
+            return {query: self.search_attacks(query) for query in queries}
+
+        automaton = ahocorasick.Automaton()
+        for query, query_lower in lowered.items():
+            automaton.add_word(query_lower, query)
+        automaton.make_automaton()
+
+        results = {query: {'jailbreak': [], 'seed_prompts': []} for query in queries}
+        for names, corpus, kind in (
+            (self._jb_names, self._jb_searchable, 'jailbreak'),
+            (self._seed_names, self._seed_searchable, 'seed_prompts'),
+        ):
+            for i, text in enumerate(corpus):
+                seen = set()
+                for _, query in automaton.iter(text):
+                    if query not in seen:
+                        seen.add(query)
+                        results[query][kind].append(names[i])
+                        if len(seen) == len(results):
+                            break
+        return results
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about loaded attacks."""
-        total_jailbreaks = len(self.jailbreak_attacks)
-        total_seeds = len(self.seed_attacks)
-        
-        jailbreak_categories = set(attack['category'] for attack in self.jailbreak_attacks.values())
-        seed_categories = set(attack['category'] for attack in self.seed_attacks.values())
-        
-        return {
-            'total_jailbreak_attacks': total_jailbreaks,
-            'total_seed_attacks': total_seeds,
-            'total_attacks': total_jailbreaks + total_seeds,
-            'jailbreak_categories': len(jailbreak_categories),
-            'seed_categories': len(seed_categories),
-            'unique_categories': len(jailbreak_categories | seed_categories)
-        }
+        self._ensure_seeds_loaded()
+        return dict(self._stats)
+
+def encode_attack(attack: Dict[str, Any]) -> bytes:
+    """Serialize an attack dict to JSON bytes on the hot reporting path.
+
+    Uses orjson's C encoder when available; otherwise compact stdlib
+    json. Tuple-valued fields (shared empty metadata) encode as arrays
+    either way.
+    """
+    if orjson is not None:
+        return orjson.dumps(attack)
+    import json
+    return json.dumps(attack, separators=(',', ':'), default=list).encode('utf-8')
+
+@functools.lru_cache(maxsize=None)
+def get_attack_loader(jailbreak_dir: str = "jailbreak", seed_prompts_dir: str = "seed_prompts") -> AttackLoader:
+    """Get a process-wide AttackLoader, constructed once per directory pair.
+
+    Callers that used to instantiate AttackLoader() directly each paid a
+    full scan+parse; the memoized factory makes repeat construction an
+    O(1) lookup. Thread-safe via lru_cache.
+    """
+    return AttackLoader(jailbreak_dir, seed_prompts_dir)
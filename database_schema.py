@@ -16,74 +16,285 @@ Database Schema:
 
 import os
 import datetime
+import logging
+import threading
+from operator import itemgetter
 from typing import Dict, List, Any, Optional
 import clickhouse_connect
+from clickhouse_connect.driver import httputil
+
+logger = logging.getLogger(__name__)
+
+def _build_ch_params() -> Optional[Dict[str, Any]]:
+    """Read connection parameters from the environment once.
+
+    Returns None when CH_HOST is unset (mock mode). Module-level so the
+    env lookups and client settings live in one place rather than being
+    rebuilt inside every connection attempt.
+    """
+    if not os.getenv("CH_HOST"):
+        return None
+    return {
+        "host": os.getenv("CH_HOST"),
+        "username": os.getenv("CH_USER"),
+        "password": os.getenv("CH_PASSWORD"),
+        "database": os.getenv("CH_DATABASE"),
+        # Shared urllib3 pool so concurrent flushes reuse keep-alive
+        # sockets instead of reconnecting.
+        "pool_mgr": httputil.get_pool_manager(maxsize=16),
+        "compress": "lz4",
+        "settings": {
+            # Let the server coalesce small inserts instead of blocking
+            # each flush on its own part write.
+            "async_insert": 1,
+            "wait_for_async_insert": 0,
+            "insert_block_size": 1048576,
+            "min_insert_block_size_rows": 100000,
+        },
+    }
 
 class ClickHouseDatabase:
     """Enhanced ClickHouse database operations for attack intelligence."""
-    
+
+    # Rows per table buffered client-side before a flush; one insert per
+    # flush forms one MergeTree part instead of one part per row.
+    BATCH_SIZE = 8192
+
+    # Fixed column order per buffered table; rows are built as tuples in
+    # this order so the insert path does no per-row dict lookups.
+    TABLE_COLUMNS = {
+        "attack_findings": (
+            "timestamp", "website_url", "attack_type", "jailbreak_name",
+            "seed_prompt_name", "attack_message", "chatbot_response",
+            "vulnerability_type", "severity", "confidence", "success",
+            "indicators", "snippet", "response_length", "execution_time_ms",
+            "attack_metadata"
+        ),
+        "attack_methods": (
+            "method_name", "method_type", "category", "description",
+            "template_content", "success_rate", "avg_confidence",
+            "total_uses", "successful_uses", "last_used",
+            "effectiveness_score", "vulnerability_types", "created_at",
+            "updated_at"
+        ),
+        "website_profiles": (
+            "website_url", "first_seen", "last_attacked", "total_attacks",
+            "successful_attacks", "vulnerability_types",
+            "common_response_patterns", "defense_mechanisms",
+            "attack_success_patterns", "risk_level", "profile_metadata",
+            "updated_at"
+        ),
+        "adaptive_intelligence": (
+            "pattern_id", "website_pattern", "vulnerability_type",
+            "effective_attacks", "ineffective_attacks",
+            "success_probability", "confidence_threshold",
+            "context_indicators", "recommendation_metadata", "created_at",
+            "updated_at"
+        ),
+        "translations": (
+            "text_hash", "lang", "text", "translated"
+        ),
+    }
+
+    # Each buffer is sorted to match its table's MergeTree ORDER BY so
+    # inserted blocks arrive pre-ordered (cheaper part creation, better
+    # compression); indexes refer to positions in TABLE_COLUMNS.
+    SORT_KEYS = {
+        "attack_findings": itemgetter(1, 0, 2),
+        "attack_methods": itemgetter(0, 1),
+        "website_profiles": itemgetter(0),
+        "adaptive_intelligence": itemgetter(0, 1),
+        "translations": itemgetter(0, 1),
+    }
+
+    # ReplacingMergeTree tables are deduplicated in the buffer on their
+    # ORDER BY key (last write wins) so merges have less churn to resolve.
+    DEDUP_KEYS = {
+        "attack_methods": itemgetter(0, 1),
+        "website_profiles": itemgetter(0),
+        "adaptive_intelligence": itemgetter(0, 1),
+        "translations": itemgetter(0, 1),
+    }
+
+    # Inverse of the severity_code MATERIALIZED expression on
+    # attack_findings; used to map aggregated codes back to labels.
+    SEVERITY_NAMES = {3: "HIGH", 2: "MEDIUM", 1: "LOW", 0: "UNKNOWN"}
+
     def __init__(self):
         self.client = None
+        self._buffers = {table: [] for table in self.TABLE_COLUMNS}
+        self._buffer_lock = threading.Lock()
+        self._schema_ready = False
         self._initialize_connection()
-        if self.client:
+
+    def _ensure_schema(self):
+        """Create the schema once, on the first write that needs it."""
+        if not self._schema_ready and self.client:
             self._create_schema()
+            self._schema_ready = True
+
+    def _buffer_row(self, table: str, row: tuple) -> bool:
+        """Queue one row for batched insert, flushing at BATCH_SIZE."""
+        if not self.client:
+            return False
+        self._ensure_schema()
+        with self._buffer_lock:
+            buffer = self._buffers[table]
+            buffer.append(row)
+            full = len(buffer) >= self.BATCH_SIZE
+        if full:
+            return self._flush(table)
+        return True
+
+    def _flush(self, table: str) -> bool:
+        """Insert all buffered rows for a table in one native-format block."""
+        if not self.client:
+            return True
+        # Swap the buffer out under the lock; the network insert happens
+        # outside it so concurrent writers never block on I/O.
+        with self._buffer_lock:
+            buffer = self._buffers[table]
+            if not buffer:
+                return True
+            self._buffers[table] = []
+        if table in self.DEDUP_KEYS:
+            key = self.DEDUP_KEYS[table]
+            buffer = list({key(row): row for row in buffer}.values())
+        if table in self.SORT_KEYS:
+            buffer.sort(key=self.SORT_KEYS[table])
+        try:
+            # Transpose to column order before handing off: the driver
+            # serializes native blocks column-by-column, so this skips
+            # its internal row pivot. async_insert is off here because
+            # blocks are already batched and sorted client-side.
+            columns = [list(col) for col in zip(*buffer)]
+            self.client.insert(table, columns,
+                               column_names=self.TABLE_COLUMNS[table],
+                               column_oriented=True,
+                               settings={"async_insert": 0})
+            return True
+        except Exception:
+            logger.exception("Failed to flush %d rows to %s", len(buffer), table)
+            return False
+
+    def flush_all(self) -> bool:
+        """Flush every buffered table; returns False if any flush failed."""
+        return all([self._flush(table) for table in self._buffers])
     
     def _initialize_connection(self):
         """Initialize ClickHouse connection."""
         try:
-            if os.getenv("CH_HOST"):
-                self.client = clickhouse_connect.get_client(
-                    host=os.getenv("CH_HOST"),
-                    username=os.getenv("CH_USER"),
-                    password=os.getenv("CH_PASSWORD"),
-                    database=os.getenv("CH_DATABASE")
-                )
-                print("✅ ClickHouse connection established")
+            params = _build_ch_params()
+            if params:
+                self.client = clickhouse_connect.get_client(**params)
+                logger.info("ClickHouse connection established")
             else:
-                print("⚠️ ClickHouse not configured - using mock mode")
-        except Exception as e:
+                logger.warning("ClickHouse not configured - using mock mode")
+        except Exception:
+            logger.exception("ClickHouse connection failed")
             self.client = None
     
     def _create_schema(self):
-        """Create comprehensive database schema."""
+        """Create comprehensive database schema.
+
+        Note: CREATE TABLE IF NOT EXISTS does not alter tables that already
+        exist, so pre-existing deployments keep plain String columns until
+        migrated manually, e.g.:
+            ALTER TABLE attack_findings
+                MODIFY COLUMN attack_type LowCardinality(String)
+        """
         if not self.client:
             return
-        
+
+        # Warm-start probe: if every table already exists, skip the six DDL
+        # round trips entirely (CREATE IF NOT EXISTS still costs a round
+        # trip and a metadata lock each).
+        expected_tables = (
+            "attack_findings", "attack_methods", "website_profiles",
+            "attack_effectiveness", "adaptive_intelligence", "attack_sequences",
+            "mv_attack_agg", "translations"
+        )
+        try:
+            existing = self.client.command(
+                "SELECT count() FROM system.tables "
+                "WHERE database = currentDatabase() AND name IN %(tables)s",
+                parameters={"tables": expected_tables}
+            )
+            if int(existing) == len(expected_tables):
+                return
+        except Exception:
+            pass  # fall through to the idempotent CREATEs
+
+        # Partition granule is tunable per deployment: toYYYYMM keeps part
+        # counts low for steady usage, toYYYYMMDD suits heavy demo churn.
+        granule = os.getenv("CH_PARTITION_GRANULE", "toYYYYMM")
+        settings = """SETTINGS index_granularity = 8192,
+                    parts_to_delay_insert = 300,
+                    parts_to_throw_insert = 3000"""
+
         try:
             # Attack findings table - stores individual attack results
-            self.client.command("""
+            self.client.command(f"""
                 CREATE TABLE IF NOT EXISTS attack_findings (
-                    timestamp DateTime DEFAULT now(),
+                    timestamp DateTime DEFAULT now() CODEC(DoubleDelta, ZSTD(1)),
                     website_url String,
-                    attack_type String,
-                    jailbreak_name String,
-                    seed_prompt_name String,
-                    attack_message String,
-                    chatbot_response String,
-                    vulnerability_type String,
-                    severity String,
-                    confidence Float32,
+                    attack_type LowCardinality(String),
+                    jailbreak_name LowCardinality(String),
+                    seed_prompt_name LowCardinality(String),
+                    attack_message String CODEC(ZSTD(3)),
+                    chatbot_response String CODEC(ZSTD(3)),
+                    vulnerability_type LowCardinality(String),
+                    severity LowCardinality(String),
+                    confidence Float32 CODEC(Gorilla, ZSTD(1)),
                     success UInt8,
                     indicators Array(String),
-                    snippet String,
-                    response_length UInt32,
-                    execution_time_ms UInt32,
-                    attack_metadata String
+                    snippet String CODEC(ZSTD(3)),
+                    response_length UInt32 CODEC(Delta, ZSTD(1)),
+                    execution_time_ms UInt32 CODEC(Delta, ZSTD(1)),
+                    attack_metadata String CODEC(ZSTD(3)),
+                    response_prefix String MATERIALIZED substring(chatbot_response, 1, 100) CODEC(ZSTD(3)),
+                    severity_code UInt8 MATERIALIZED multiIf(severity = 'HIGH', 3, severity = 'MEDIUM', 2, severity = 'LOW', 1, 0) CODEC(T64, ZSTD(1)),
+                    INDEX idx_vuln vulnerability_type TYPE bloom_filter(0.01) GRANULARITY 4,
+                    INDEX idx_attack attack_type TYPE bloom_filter(0.01) GRANULARITY 4,
+                    INDEX idx_success success TYPE set(2) GRANULARITY 4,
+                    PROJECTION p_effective (
+                        SELECT
+                            website_url,
+                            attack_type,
+                            jailbreak_name,
+                            seed_prompt_name,
+                            vulnerability_type,
+                            COUNT(*),
+                            SUM(success),
+                            AVG(confidence)
+                        GROUP BY website_url, attack_type, jailbreak_name, seed_prompt_name, vulnerability_type
+                    ),
+                    PROJECTION p_daily (
+                        SELECT
+                            toDate(timestamp),
+                            attack_type,
+                            vulnerability_type,
+                            COUNT(*),
+                            SUM(success),
+                            AVG(confidence)
+                        GROUP BY toDate(timestamp), attack_type, vulnerability_type
+                    )
                 ) ENGINE = MergeTree()
                 ORDER BY (website_url, timestamp, attack_type)
-                PARTITION BY toYYYYMM(timestamp)
+                PARTITION BY {granule}(timestamp)
+                {settings}
             """)
             
             # Attack methods table - stores attack method metadata and effectiveness
-            self.client.command("""
+            self.client.command(f"""
                 CREATE TABLE IF NOT EXISTS attack_methods (
                     method_name String,
-                    method_type String,  -- 'jailbreak', 'seed_prompt', 'combo'
-                    category String,
+                    method_type LowCardinality(String),  -- 'jailbreak', 'seed_prompt', 'combo'
+                    category LowCardinality(String),
                     description String,
-                    template_content String,
+                    template_content String CODEC(ZSTD(3)),
                     success_rate Float32,
-                    avg_confidence Float32,
+                    avg_confidence Float32 CODEC(Gorilla, ZSTD(1)),
                     total_uses UInt32,
                     successful_uses UInt32,
                     last_used DateTime,
@@ -93,10 +304,11 @@ class ClickHouseDatabase:
                     updated_at DateTime DEFAULT now()
                 ) ENGINE = ReplacingMergeTree(updated_at)
                 ORDER BY (method_name, method_type)
+                {settings}
             """)
             
             # Website profiles table - stores target characteristics and patterns
-            self.client.command("""
+            self.client.command(f"""
                 CREATE TABLE IF NOT EXISTS website_profiles (
                     website_url String,
                     first_seen DateTime DEFAULT now(),
@@ -107,155 +319,176 @@ class ClickHouseDatabase:
                     common_response_patterns Array(String),
                     defense_mechanisms Array(String),
                     attack_success_patterns Array(String),
-                    risk_level String,
-                    profile_metadata String,
+                    risk_level LowCardinality(String),
+                    profile_metadata String CODEC(ZSTD(3)),
                     updated_at DateTime DEFAULT now()
                 ) ENGINE = ReplacingMergeTree(updated_at)
                 ORDER BY website_url
+                {settings}
             """)
             
             # Attack effectiveness table - tracks success rates and patterns
-            self.client.command("""
+            self.client.command(f"""
                 CREATE TABLE IF NOT EXISTS attack_effectiveness (
-                    timestamp DateTime DEFAULT now(),
-                    attack_type String,
+                    timestamp DateTime DEFAULT now() CODEC(DoubleDelta, ZSTD(1)),
+                    attack_type LowCardinality(String),
                     website_url String,
                     success UInt8,
-                    confidence Float32,
-                    response_time_ms UInt32,
+                    confidence Float32 CODEC(Gorilla, ZSTD(1)),
+                    response_time_ms UInt32 CODEC(Delta, ZSTD(1)),
                     vulnerability_detected UInt8,
-                    severity String,
-                    attack_combination String,
-                    context_metadata String
+                    severity LowCardinality(String),
+                    attack_combination LowCardinality(String),
+                    context_metadata String CODEC(ZSTD(3))
                 ) ENGINE = MergeTree()
                 ORDER BY (attack_type, timestamp)
-                PARTITION BY toYYYYMM(timestamp)
+                PARTITION BY {granule}(timestamp)
+                {settings}
             """)
             
             # Adaptive intelligence table - stores learned patterns for attack selection
-            self.client.command("""
+            self.client.command(f"""
                 CREATE TABLE IF NOT EXISTS adaptive_intelligence (
                     pattern_id String,
                     website_pattern String,
-                    vulnerability_type String,
+                    vulnerability_type LowCardinality(String),
                     effective_attacks Array(String),
                     ineffective_attacks Array(String),
                     success_probability Float32,
                     confidence_threshold Float32,
                     context_indicators Array(String),
-                    recommendation_metadata String,
+                    recommendation_metadata String CODEC(ZSTD(3)),
                     created_at DateTime DEFAULT now(),
                     updated_at DateTime DEFAULT now()
                 ) ENGINE = ReplacingMergeTree(updated_at)
                 ORDER BY (pattern_id, website_pattern)
+                {settings}
             """)
             
             # Attack sequences table - stores successful attack chains
-            self.client.command("""
+            self.client.command(f"""
                 CREATE TABLE IF NOT EXISTS attack_sequences (
                     sequence_id String,
                     website_url String,
                     attack_chain Array(String),
                     total_success UInt8,
                     vulnerability_types Array(String),
-                    max_severity String,
+                    max_severity LowCardinality(String),
                     execution_time_seconds UInt32,
-                    sequence_metadata String,
+                    sequence_metadata String CODEC(ZSTD(3)),
                     created_at DateTime DEFAULT now()
                 ) ENGINE = MergeTree()
                 ORDER BY (website_url, created_at)
+                PARTITION BY {granule}(created_at)
+                {settings}
             """)
+
+            # Persistent DeepL translation cache keyed by content hash
+            self.client.command("""
+                CREATE TABLE IF NOT EXISTS translations (
+                    text_hash FixedString(16),
+                    lang LowCardinality(String),
+                    text String CODEC(ZSTD(3)),
+                    translated String CODEC(ZSTD(3))
+                ) ENGINE = ReplacingMergeTree()
+                ORDER BY (text_hash, lang)
+            """)
+
+            # Incremental rollup of attack outcomes, maintained on insert;
+            # per-site effectiveness reads hit this instead of raw findings.
+            self.client.command("""
+                CREATE MATERIALIZED VIEW IF NOT EXISTS mv_attack_agg
+                ENGINE = SummingMergeTree()
+                ORDER BY (website_url, attack_type, jailbreak_name, seed_prompt_name, vulnerability_type)
+                AS SELECT
+                    website_url,
+                    attack_type,
+                    jailbreak_name,
+                    seed_prompt_name,
+                    vulnerability_type,
+                    count() as usage_count,
+                    sum(success) as success_count,
+                    sum(confidence) as confidence_sum
+                FROM attack_findings
+                GROUP BY website_url, attack_type, jailbreak_name, seed_prompt_name, vulnerability_type
+            """)
+
+            logger.info("Database schema created successfully")
             
-            print("✅ Database schema created successfully")
-            
-        except Exception as e:
-            print(f"❌ Schema creation failed: {e}")
+        except Exception:
+            logger.exception("Schema creation failed")
     
     def store_attack_finding(self, finding_data: Dict[str, Any]) -> bool:
         """Store individual attack finding."""
-        if not self.client:
-            return False
-        
         try:
-            self.client.command("""
-                INSERT INTO attack_findings VALUES (
-                    now(),
-                    %(website_url)s,
-                    %(attack_type)s,
-                    %(jailbreak_name)s,
-                    %(seed_prompt_name)s,
-                    %(attack_message)s,
-                    %(chatbot_response)s,
-                    %(vulnerability_type)s,
-                    %(severity)s,
-                    %(confidence)s,
-                    %(success)s,
-                    %(indicators)s,
-                    %(snippet)s,
-                    %(response_length)s,
-                    %(execution_time_ms)s,
-                    %(attack_metadata)s
-                )
-            """, finding_data)
-            return True
-        except Exception as e:
-            print(f"❌ Failed to store attack finding: {e}")
+            # Callers pass the timestamp captured when the attack finished
+            # so the finding, profile and method rows for one logical
+            # event agree; fall back to now() for direct calls.
+            return self._buffer_row("attack_findings", (
+                finding_data.get("timestamp") or datetime.datetime.now(),
+                finding_data["website_url"],
+                finding_data["attack_type"],
+                finding_data["jailbreak_name"],
+                finding_data["seed_prompt_name"],
+                finding_data["attack_message"],
+                finding_data["chatbot_response"],
+                finding_data["vulnerability_type"],
+                finding_data["severity"],
+                finding_data["confidence"],
+                finding_data["success"],
+                finding_data["indicators"],
+                finding_data["snippet"],
+                finding_data["response_length"],
+                finding_data["execution_time_ms"],
+                finding_data["attack_metadata"]
+            ))
+        except Exception:
+            logger.exception("Failed to store attack finding")
             return False
     
     def store_attack_method(self, method_data: Dict[str, Any]) -> bool:
         """Store or update attack method metadata."""
-        if not self.client:
-            return False
-        
         try:
-            self.client.command("""
-                INSERT INTO attack_methods VALUES (
-                    %(method_name)s,
-                    %(method_type)s,
-                    %(category)s,
-                    %(description)s,
-                    %(template_content)s,
-                    %(success_rate)s,
-                    %(avg_confidence)s,
-                    %(total_uses)s,
-                    %(successful_uses)s,
-                    %(last_used)s,
-                    %(effectiveness_score)s,
-                    %(vulnerability_types)s,
-                    now(),
-                    now()
-                )
-            """, method_data)
-            return True
-        except Exception as e:
-            print(f"❌ Failed to store attack method: {e}")
+            now = datetime.datetime.now()
+            return self._buffer_row("attack_methods", (
+                method_data["method_name"],
+                method_data["method_type"],
+                method_data["category"],
+                method_data["description"],
+                method_data["template_content"],
+                method_data["success_rate"],
+                method_data["avg_confidence"],
+                method_data["total_uses"],
+                method_data["successful_uses"],
+                method_data["last_used"],
+                method_data["effectiveness_score"],
+                method_data["vulnerability_types"],
+                now,
+                now
+            ))
+        except Exception:
+            logger.exception("Failed to store attack method")
             return False
     
     def update_website_profile(self, website_data: Dict[str, Any]) -> bool:
         """Update website profile with new attack data."""
-        if not self.client:
-            return False
-        
         try:
-            self.client.command("""
-                INSERT INTO website_profiles VALUES (
-                    %(website_url)s,
-                    %(first_seen)s,
-                    %(last_attacked)s,
-                    %(total_attacks)s,
-                    %(successful_attacks)s,
-                    %(vulnerability_types)s,
-                    %(common_response_patterns)s,
-                    %(defense_mechanisms)s,
-                    %(attack_success_patterns)s,
-                    %(risk_level)s,
-                    %(profile_metadata)s,
-                    now()
-                )
-            """, website_data)
-            return True
-        except Exception as e:
-            print(f"❌ Failed to update website profile: {e}")
+            return self._buffer_row("website_profiles", (
+                website_data["website_url"],
+                website_data["first_seen"],
+                website_data["last_attacked"],
+                website_data["total_attacks"],
+                website_data["successful_attacks"],
+                website_data["vulnerability_types"],
+                website_data["common_response_patterns"],
+                website_data["defense_mechanisms"],
+                website_data["attack_success_patterns"],
+                website_data["risk_level"],
+                website_data["profile_metadata"],
+                datetime.datetime.now()
+            ))
+        except Exception:
+            logger.exception("Failed to update website profile")
             return False
     
     def get_effective_attacks_for_website(self, website_url: str, limit: int = 10) -> List[Dict]:
@@ -264,28 +497,28 @@ class ClickHouseDatabase:
             return []
         
         try:
+            # Reads the mv_attack_agg rollup; SummingMergeTree sums lazily
+            # on merge, so the query re-aggregates the partial sums.
             result = self.client.query("""
-                SELECT 
+                SELECT
                     attack_type,
                     jailbreak_name,
                     seed_prompt_name,
-                    success,
-                    confidence,
                     vulnerability_type,
-                    severity,
-                    COUNT(*) as usage_count,
-                    AVG(confidence) as avg_confidence,
-                    SUM(success) as success_count
-                FROM attack_findings 
+                    SUM(usage_count) as usage_count,
+                    SUM(confidence_sum) / SUM(usage_count) as avg_confidence,
+                    SUM(success_count) as success_count
+                FROM mv_attack_agg
                 WHERE website_url = %(website_url)s
-                GROUP BY attack_type, jailbreak_name, seed_prompt_name, success, confidence, vulnerability_type, severity
-                ORDER BY success DESC, avg_confidence DESC
+                GROUP BY attack_type, jailbreak_name, seed_prompt_name, vulnerability_type
+                ORDER BY success_count DESC, avg_confidence DESC
                 LIMIT %(limit)s
+                SETTINGS optimize_aggregation_in_order = 1
             """, {"website_url": website_url, "limit": limit})
             
-            return [dict(row) for row in result.result_rows]
-        except Exception as e:
-            print(f"❌ Failed to get effective attacks: {e}")
+            return list(result.named_results())
+        except Exception:
+            logger.exception("Failed to get effective attacks")
             return []
     
     def get_ineffective_attacks_for_website(self, website_url: str, limit: int = 10) -> List[Dict]:
@@ -295,25 +528,23 @@ class ClickHouseDatabase:
         
         try:
             result = self.client.query("""
-                SELECT 
+                SELECT
                     attack_type,
                     jailbreak_name,
                     seed_prompt_name,
-                    success,
-                    confidence,
                     vulnerability_type,
                     COUNT(*) as usage_count,
                     AVG(confidence) as avg_confidence
-                FROM attack_findings 
+                FROM attack_findings
                 WHERE website_url = %(website_url)s AND success = 0
-                GROUP BY attack_type, jailbreak_name, seed_prompt_name, success, confidence, vulnerability_type
+                GROUP BY attack_type, jailbreak_name, seed_prompt_name, vulnerability_type
                 ORDER BY usage_count DESC, avg_confidence ASC
                 LIMIT %(limit)s
             """, {"website_url": website_url, "limit": limit})
             
-            return [dict(row) for row in result.result_rows]
-        except Exception as e:
-            print(f"❌ Failed to get ineffective attacks: {e}")
+            return list(result.named_results())
+        except Exception:
+            logger.exception("Failed to get ineffective attacks")
             return []
     
     def get_website_vulnerability_patterns(self, website_url: str) -> Dict[str, Any]:
@@ -328,20 +559,29 @@ class ClickHouseDatabase:
                     vulnerability_type,
                     COUNT(*) as count,
                     AVG(confidence) as avg_confidence,
-                    MAX(severity) as max_severity
-                FROM attack_findings 
+                    MAX(severity_code) as max_severity_code
+                FROM attack_findings
                 WHERE website_url = %(website_url)s AND success = 1
                 GROUP BY vulnerability_type
                 ORDER BY count DESC
             """, {"website_url": website_url})
+
+            # MAX over the numeric code ranks HIGH > MEDIUM > LOW correctly;
+            # lexicographic MAX(severity) put LOW above HIGH.
+            vulnerability_types = []
+            for entry in vuln_result.named_results():
+                code = entry.pop("max_severity_code", 0)
+                entry["max_severity"] = self.SEVERITY_NAMES.get(code, "UNKNOWN")
+                vulnerability_types.append(entry)
             
-            # Get common response patterns
+            # Get common response patterns; response_prefix is materialized
+            # at insert so grouping never decompresses full responses.
             response_result = self.client.query("""
-                SELECT 
-                    SUBSTRING(chatbot_response, 1, 100) as response_start,
+                SELECT
+                    response_prefix as response_start,
                     COUNT(*) as frequency,
                     AVG(confidence) as avg_confidence
-                FROM attack_findings 
+                FROM attack_findings
                 WHERE website_url = %(website_url)s
                 GROUP BY response_start
                 ORDER BY frequency DESC
@@ -349,11 +589,11 @@ class ClickHouseDatabase:
             """, {"website_url": website_url})
             
             return {
-                "vulnerability_types": [dict(row) for row in vuln_result.result_rows],
-                "response_patterns": [dict(row) for row in response_result.result_rows]
+                "vulnerability_types": vulnerability_types,
+                "response_patterns": list(response_result.named_results())
             }
-        except Exception as e:
-            print(f"❌ Failed to get vulnerability patterns: {e}")
+        except Exception:
+            logger.exception("Failed to get vulnerability patterns")
             return {}
     
     def get_adaptive_attack_recommendations(self, website_url: str, target_vulnerability_types: Optional[List[str]] = None) -> List[Dict]:
@@ -362,35 +602,37 @@ class ClickHouseDatabase:
             return []
         
         try:
-            # Get successful attacks for similar vulnerability types
+            # Get successful attacks for similar vulnerability types;
+            # the IN list is bound as a parameter, never spliced into SQL.
             where_clause = "WHERE website_url = %(website_url)s AND success = 1"
             params = {"website_url": website_url}
-            
+
             if target_vulnerability_types:
-                vuln_types_str = "', '".join(target_vulnerability_types)
-                where_clause += f" AND vulnerability_type IN ('{vuln_types_str}')"
+                where_clause += " AND vulnerability_type IN %(vuln_types)s"
+                params["vuln_types"] = tuple(target_vulnerability_types)
             
+            # severity/confidence are aggregated rather than grouped on, so
+            # each attack combination collapses to a single recommendation.
             result = self.client.query(f"""
-                SELECT 
+                SELECT
                     attack_type,
                     jailbreak_name,
                     seed_prompt_name,
                     vulnerability_type,
-                    severity,
-                    confidence,
+                    argMax(severity, confidence) as severity,
                     COUNT(*) as success_count,
                     AVG(confidence) as avg_confidence,
                     MAX(timestamp) as last_success
-                FROM attack_findings 
+                FROM attack_findings
                 {where_clause}
-                GROUP BY attack_type, jailbreak_name, seed_prompt_name, vulnerability_type, severity, confidence
+                GROUP BY attack_type, jailbreak_name, seed_prompt_name, vulnerability_type
                 ORDER BY success_count DESC, avg_confidence DESC
                 LIMIT 20
             """, params)
             
-            return [dict(row) for row in result.result_rows]
-        except Exception as e:
-            print(f"❌ Failed to get adaptive recommendations: {e}")
+            return list(result.named_results())
+        except Exception:
+            logger.exception("Failed to get adaptive recommendations")
             return []
     
     def get_attack_method_effectiveness(self, method_name: Optional[str] = None, method_type: Optional[str] = None) -> List[Dict]:
@@ -410,54 +652,137 @@ class ClickHouseDatabase:
                 where_clause += " AND method_type = %(method_type)s"
                 params["method_type"] = method_type
             
+            # ReplacingMergeTree dedupes on merge, not read; argMax over
+            # updated_at returns the latest version of each method without
+            # the cost of FINAL.
             result = self.client.query(f"""
-                SELECT 
+                SELECT
                     method_name,
                     method_type,
-                    category,
-                    success_rate,
-                    avg_confidence,
-                    total_uses,
-                    successful_uses,
-                    effectiveness_score,
-                    vulnerability_types,
-                    last_used
-                FROM attack_methods 
+                    argMax(category, updated_at) as category,
+                    argMax(success_rate, updated_at) as success_rate,
+                    argMax(avg_confidence, updated_at) as avg_confidence,
+                    argMax(total_uses, updated_at) as total_uses,
+                    argMax(successful_uses, updated_at) as successful_uses,
+                    argMax(effectiveness_score, updated_at) as effectiveness_score,
+                    argMax(vulnerability_types, updated_at) as vulnerability_types,
+                    argMax(last_used, updated_at) as last_used
+                FROM attack_methods
                 {where_clause}
+                GROUP BY method_name, method_type
                 ORDER BY effectiveness_score DESC, success_rate DESC
             """, params)
             
-            return [dict(row) for row in result.result_rows]
-        except Exception as e:
-            print(f"❌ Failed to get method effectiveness: {e}")
+            return list(result.named_results())
+        except Exception:
+            logger.exception("Failed to get method effectiveness")
             return []
     
     def store_adaptive_intelligence(self, intelligence_data: Dict[str, Any]) -> bool:
         """Store learned patterns for adaptive attack selection."""
+        try:
+            now = datetime.datetime.now()
+            return self._buffer_row("adaptive_intelligence", (
+                intelligence_data["pattern_id"],
+                intelligence_data["website_pattern"],
+                intelligence_data["vulnerability_type"],
+                intelligence_data["effective_attacks"],
+                intelligence_data["ineffective_attacks"],
+                intelligence_data["success_probability"],
+                intelligence_data["confidence_threshold"],
+                intelligence_data["context_indicators"],
+                intelligence_data["recommendation_metadata"],
+                now,
+                now
+            ))
+        except Exception:
+            logger.exception("Failed to store adaptive intelligence")
+            return False
+    
+    def optimize_replacing_tables(self) -> bool:
+        """Force background dedup of the ReplacingMergeTree tables.
+
+        Upserts land as plain inserts and rely on merges to collapse old
+        versions; running this periodically (or at shutdown) keeps read
+        amplification down without FINAL on every query.
+        """
         if not self.client:
             return False
-        
+        ok = True
+        for table in self.DEDUP_KEYS:
+            try:
+                self.client.command(f"OPTIMIZE TABLE {table} FINAL")
+            except Exception:
+                logger.exception("Failed to optimize %s", table)
+                ok = False
+        return ok
+
+    def store_translation(self, text_hash: bytes, lang: str, text: str, translated: str) -> bool:
+        """Buffer one cached translation for batched write-back."""
+        return self._buffer_row("translations", (text_hash, lang, text, translated))
+
+    def get_translations(self, hashes: List[bytes], lang: str) -> Dict[bytes, str]:
+        """Look up previously stored translations for a batch of hashes."""
+        if not self.client or not hashes:
+            return {}
         try:
-            self.client.command("""
-                INSERT INTO adaptive_intelligence VALUES (
-                    %(pattern_id)s,
-                    %(website_pattern)s,
-                    %(vulnerability_type)s,
-                    %(effective_attacks)s,
-                    %(ineffective_attacks)s,
-                    %(success_probability)s,
-                    %(confidence_threshold)s,
-                    %(context_indicators)s,
-                    %(recommendation_metadata)s,
-                    now(),
-                    now()
+            result = self.client.query("""
+                SELECT text_hash, translated
+                FROM translations
+                WHERE lang = %(lang)s AND text_hash IN %(hashes)s
+            """, parameters={"lang": lang, "hashes": tuple(hashes)})
+            return {row[0]: row[1] for row in result.result_rows}
+        except Exception:
+            logger.exception("Failed to read translation cache")
+            return {}
+
+    def get_trend_summary(self, website_url: Optional[str] = None, days_back: int = 30) -> Dict[str, Any]:
+        """Aggregate effectiveness trends fully server-side.
+
+        Returns a single fixed-size row regardless of how many findings
+        exist; the p_daily projection covers the unfiltered case.
+        """
+        if not self.client:
+            return {}
+
+        try:
+            where_clause = "WHERE timestamp >= now() - INTERVAL %(days_back)s DAY"
+            params: Dict[str, Any] = {"days_back": days_back}
+            if website_url:
+                where_clause += " AND website_url = %(website_url)s"
+                params["website_url"] = website_url
+
+            # The best attack type needs a per-type success rate, so it
+            # comes from a tiny GROUP BY subquery; the aggregate wrappers
+            # (any/max) keep the scalar subqueries valid on no findings.
+            result = self.client.query(f"""
+                WITH best AS (
+                    SELECT
+                        attack_type,
+                        countIf(success = 1) / COUNT(*) as success_rate
+                    FROM attack_findings
+                    {where_clause}
+                    GROUP BY attack_type
+                    ORDER BY success_rate DESC
+                    LIMIT 1
                 )
-            """, intelligence_data)
-            return True
-        except Exception as e:
-            print(f"❌ Failed to store adaptive intelligence: {e}")
-            return False
-    
+                SELECT
+                    COUNT(*) as total_attacks,
+                    countIf(success = 1) as successful_attacks,
+                    uniqExact(vulnerability_type) as vulnerability_diversity,
+                    topK(3)(vulnerability_type) as top_vulnerabilities,
+                    (SELECT any(attack_type) FROM best) as most_effective_attack,
+                    (SELECT max(success_rate) FROM best) as most_effective_success_rate,
+                    uniqExact(attack_type) as attack_type_count
+                FROM attack_findings
+                {where_clause}
+            """, params)
+            rows = list(result.named_results())
+            return rows[0] if rows else {}
+        except Exception:
+            logger.exception("Failed to get trend summary")
+            return {}
+
     def get_attack_statistics(self, website_url: Optional[str] = None, days_back: int = 30) -> Dict[str, Any]:
         """Get comprehensive attack statistics."""
         if not self.client:
@@ -471,57 +796,104 @@ class ClickHouseDatabase:
                 where_clause += " AND website_url = %(website_url)s"
                 params["website_url"] = website_url
             
-            # Overall statistics
-            stats_result = self.client.query(f"""
-                SELECT 
-                    COUNT(*) as total_attacks,
-                    SUM(success) as successful_attacks,
+            # Overall totals, vulnerability breakdown and per-attack-type
+            # effectiveness in a single scan: each UNION ALL branch tags its
+            # rows with a section label and the Python side fans them back out.
+            result = self.client.query(f"""
+                SELECT
+                    'overall' as section,
+                    '' as key,
+                    COUNT(*) as total_uses,
+                    SUM(success) as successful_uses,
                     AVG(confidence) as avg_confidence,
                     COUNT(DISTINCT website_url) as unique_websites,
                     COUNT(DISTINCT attack_type) as unique_attack_types
-                FROM attack_findings 
+                FROM attack_findings
                 {where_clause}
-            """, params)
-            
-            # Vulnerability type breakdown
-            vuln_result = self.client.query(f"""
-                SELECT 
-                    vulnerability_type,
-                    COUNT(*) as count,
-                    AVG(confidence) as avg_confidence
-                FROM attack_findings 
+                UNION ALL
+                SELECT
+                    'vulnerability' as section,
+                    vulnerability_type as key,
+                    COUNT(*) as total_uses,
+                    SUM(success) as successful_uses,
+                    AVG(confidence) as avg_confidence,
+                    0 as unique_websites,
+                    0 as unique_attack_types
+                FROM attack_findings
                 {where_clause} AND success = 1
                 GROUP BY vulnerability_type
-                ORDER BY count DESC
-            """, params)
-            
-            # Attack type effectiveness
-            attack_result = self.client.query(f"""
-                SELECT 
-                    attack_type,
+                UNION ALL
+                SELECT
+                    'attack' as section,
+                    attack_type as key,
                     COUNT(*) as total_uses,
                     SUM(success) as successful_uses,
                     AVG(confidence) as avg_confidence,
-                    (SUM(success) * 100.0 / COUNT(*)) as success_rate
-                FROM attack_findings 
+                    0 as unique_websites,
+                    0 as unique_attack_types
+                FROM attack_findings
                 {where_clause}
                 GROUP BY attack_type
-                ORDER BY success_rate DESC
             """, params)
-            
-            stats = dict(stats_result.result_rows[0]) if stats_result.result_rows else {}
-            stats["vulnerability_breakdown"] = [dict(row) for row in vuln_result.result_rows]
-            stats["attack_effectiveness"] = [dict(row) for row in attack_result.result_rows]
-            
+
+            stats: Dict[str, Any] = {}
+            vulnerability_breakdown = []
+            attack_effectiveness = []
+            for section, key, total, successes, avg_conf, sites, types in result.result_rows:
+                if section == "overall":
+                    stats = {
+                        "total_attacks": total,
+                        "successful_attacks": successes,
+                        "avg_confidence": avg_conf,
+                        "unique_websites": sites,
+                        "unique_attack_types": types,
+                    }
+                elif section == "vulnerability":
+                    vulnerability_breakdown.append({
+                        "vulnerability_type": key,
+                        "count": total,
+                        "avg_confidence": avg_conf,
+                    })
+                else:
+                    attack_effectiveness.append({
+                        "attack_type": key,
+                        "total_uses": total,
+                        "successful_uses": successes,
+                        "avg_confidence": avg_conf,
+                        "success_rate": (successes or 0) * 100.0 / total if total else 0.0,
+                    })
+
+            vulnerability_breakdown.sort(key=itemgetter("count"), reverse=True)
+            attack_effectiveness.sort(key=itemgetter("success_rate"), reverse=True)
+            stats["vulnerability_breakdown"] = vulnerability_breakdown
+            stats["attack_effectiveness"] = attack_effectiveness
+
             return stats
-        except Exception as e:
-            print(f"❌ Failed to get attack statistics: {e}")
+        except Exception:
+            logger.exception("Failed to get attack statistics")
             return {}
     
     def close(self):
-        """Close database connection."""
+        """Flush pending rows and close database connection."""
         if self.client:
+            self.flush_all()
+            self.optimize_replacing_tables()
             self.client.close()
 
+class _LazyDB:
+    """Deferred stand-in for the global database instance.
+
+    Importing this module no longer opens a connection; the real
+    ClickHouseDatabase is built on first attribute access and shared
+    by every caller from then on.
+    """
+
+    _instance: Optional[ClickHouseDatabase] = None
+
+    def __getattr__(self, name):
+        if _LazyDB._instance is None:
+            _LazyDB._instance = ClickHouseDatabase()
+        return getattr(_LazyDB._instance, name)
+
 # Global database instance
-db = ClickHouseDatabase()
+db = _LazyDB()
@@ -9,10 +9,278 @@ enabling adaptive attack strategies based on historical data and learned pattern
 
 import os
 import json
+import time
+import atexit
+import hashlib
 import datetime
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 from database_schema import db
 
+# Optional: orjson serializes leftover attack metadata faster than
+# stdlib json on the per-finding write path.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Findings are buffered in database_schema's per-table row buffers and
+# land in ClickHouse as one batched insert per flush. The timer below
+# bounds how long a quiet period can leave rows sitting in memory.
+_FLUSH_INTERVAL = float(os.getenv("REDBOT_FLUSH_INTERVAL", "5"))
+_flush_lock = threading.Lock()
+_flush_timer: Optional[threading.Timer] = None
+
+def _schedule_flush():
+    """Arm a one-shot background flush unless one is already pending."""
+    global _flush_timer
+    with _flush_lock:
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(_FLUSH_INTERVAL, _timed_flush)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+# Single background worker that owns all flush I/O, so attack execution
+# and translation never wait on a ClickHouse round trip; one worker also
+# serializes flushes against each other.
+_flush_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="redbot-flush")
+
+def flush_findings_async() -> Future:
+    """Schedule a flush on the background worker without blocking."""
+    return _flush_executor.submit(flush_findings)
+
+def _timed_flush():
+    global _flush_timer
+    with _flush_lock:
+        _flush_timer = None
+    flush_findings_async()
+
+def _prefix_hash(text: str) -> int:
+    """64-bit BLAKE2b key for a response prefix; membership tests compare
+    8 bytes instead of 100-char strings."""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+# Ceiling on common_response_patterns per profile row; without it the
+# array (and every read-modify-write of it) grows without bound.
+_MAX_RESPONSE_PATTERNS = 50
+
+# The per-attack hot path does nothing but counter increments on these
+# deltas; success-rate, running-average confidence and effectiveness
+# scoring run once per entity at flush time, so their cost scales with
+# the number of distinct websites/methods rather than attack volume.
+
+class _ProfileDelta:
+    """Per-website counters accumulated between flushes."""
+    __slots__ = ("attacks", "successes", "vuln_types", "response_patterns")
+
+    def __init__(self):
+        self.attacks = 0
+        self.successes = 0
+        self.vuln_types = set()
+        # hash -> prefix: dedup on the 64-bit key, keep the string only
+        # for the eventual Array(String) column write
+        self.response_patterns = {}
+
+class _MethodDelta:
+    """Per-attack-method counters accumulated between flushes."""
+    __slots__ = ("uses", "successes", "confidence_sum", "vuln_types",
+                 "category", "template")
+
+    def __init__(self):
+        self.uses = 0
+        self.successes = 0
+        self.confidence_sum = 0.0
+        self.vuln_types = set()
+        self.category = "custom"
+        self.template = ""
+
+# Updates are merged per key in-process during the batch window, so a
+# sweep of N attacks on one site costs one profile row and one method
+# row per flush instead of 2N read-modify-write round trips.
+_delta_lock = threading.Lock()
+_profile_deltas: Dict[str, _ProfileDelta] = {}
+_method_deltas: Dict[tuple, _MethodDelta] = {}
+
+# Short-lived profile lookups: repeated attacks on the same URL within a
+# batch window hit memory instead of ClickHouse.
+_PROFILE_TTL = 10.0
+_profile_cache: Dict[str, tuple] = {}
+
+# Every TTL-cached read registers here so a flush of new findings can
+# invalidate the lot in one pass.
+_read_caches: List[Dict] = []
+
+def _ttl_cache(ttl: float, maxsize: int = 256):
+    """Memoize a read function with expiry; lists in args become tuples
+    so keys stay hashable and stable."""
+    def decorator(fn):
+        cache: Dict[tuple, tuple] = {}
+        _read_caches.append(cache)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = tuple(tuple(a) if isinstance(a, list) else a for a in args)
+            key += tuple(sorted(
+                (k, tuple(v) if isinstance(v, list) else v)
+                for k, v in kwargs.items()
+            ))
+            now = time.monotonic()
+            hit = cache.get(key)
+            if hit and hit[0] > now:
+                return hit[1]
+            value = fn(*args, **kwargs)
+            if len(cache) >= maxsize:
+                cache.pop(next(iter(cache)))
+            cache[key] = (now + ttl, value)
+            return value
+        return wrapper
+    return decorator
+
+def _fetch_profiles(urls) -> Dict[str, Dict[str, Any]]:
+    """Fetch current profile rows for all touched URLs in one round trip."""
+    if not db.client or not urls:
+        return {}
+    try:
+        result = db.client.query("""
+            SELECT
+                website_url,
+                argMax(total_attacks, updated_at) as total_attacks,
+                argMax(successful_attacks, updated_at) as successful_attacks,
+                argMax(vulnerability_types, updated_at) as vulnerability_types,
+                argMax(common_response_patterns, updated_at) as common_response_patterns,
+                argMax(defense_mechanisms, updated_at) as defense_mechanisms,
+                argMax(attack_success_patterns, updated_at) as attack_success_patterns,
+                MIN(first_seen) as first_seen
+            FROM website_profiles
+            WHERE website_url IN %(urls)s
+            GROUP BY website_url
+        """, parameters={"urls": tuple(urls)})
+        return {row["website_url"]: row for row in result.named_results()}
+    except Exception:
+        return {}
+
+def _flush_profile_deltas(deltas: Dict[str, _ProfileDelta], now: datetime.datetime):
+    existing_profiles = _fetch_profiles(deltas.keys())
+    for url, delta in deltas.items():
+        existing = existing_profiles.get(url, {})
+        total_attacks = existing.get("total_attacks", 0) + delta.attacks
+        successful_attacks = existing.get("successful_attacks", 0) + delta.successes
+        vuln_types = set(existing.get("vulnerability_types", [])) | delta.vuln_types
+
+        # Compare 64-bit hashes against the stored patterns, then append
+        # only genuinely new prefixes.
+        existing_patterns = list(existing.get("common_response_patterns", []))
+        existing_hashes = {_prefix_hash(p) for p in existing_patterns}
+        response_patterns = existing_patterns + [
+            prefix for h, prefix in delta.response_patterns.items()
+            if h not in existing_hashes
+        ]
+        # Keep the stored array bounded: the patterns exist for display
+        # and rough fingerprinting, not exact recall, so dropping the
+        # oldest beyond the cap loses nothing actionable.
+        if len(response_patterns) > _MAX_RESPONSE_PATTERNS:
+            response_patterns = response_patterns[-_MAX_RESPONSE_PATTERNS:]
+
+        success_rate = successful_attacks / total_attacks if total_attacks > 0 else 0
+        risk_level = "LOW"
+        if success_rate > 0.7:
+            risk_level = "HIGH"
+        elif success_rate > 0.3:
+            risk_level = "MEDIUM"
+
+        db.update_website_profile({
+            "website_url": url,
+            "first_seen": existing.get("first_seen", now),
+            "last_attacked": now,
+            "total_attacks": total_attacks,
+            "successful_attacks": successful_attacks,
+            "vulnerability_types": sorted(vuln_types),
+            "common_response_patterns": response_patterns,
+            "defense_mechanisms": existing.get("defense_mechanisms", []),
+            "attack_success_patterns": existing.get("attack_success_patterns", []),
+            "risk_level": risk_level,
+            "profile_metadata": json.dumps({
+                "last_updated": now.isoformat(),
+                "success_rate": success_rate
+            })
+        })
+
+def _flush_method_deltas(deltas: Dict[tuple, _MethodDelta], now: datetime.datetime):
+    # One query covers every method; keyed lookup replaces per-attack reads.
+    existing_methods = {
+        (m.get("method_name"), m.get("method_type")): m
+        for m in db.get_attack_method_effectiveness()
+    }
+    for (method_name, method_type), delta in deltas.items():
+        existing = existing_methods.get((method_name, method_type), {})
+        prior_uses = existing.get("total_uses", 0)
+        total_uses = prior_uses + delta.uses
+        successful_uses = existing.get("successful_uses", 0) + delta.successes
+        success_rate = successful_uses / total_uses if total_uses > 0 else 0
+
+        prior_avg = existing.get("avg_confidence", 0.0)
+        new_avg_confidence = ((prior_avg * prior_uses) + delta.confidence_sum) / total_uses
+        effectiveness_score = (success_rate * 0.7) + (new_avg_confidence * 0.3)
+        vuln_types = set(existing.get("vulnerability_types", [])) | delta.vuln_types
+
+        db.store_attack_method({
+            "method_name": method_name,
+            "method_type": method_type,
+            "category": delta.category,
+            "description": f"Attack method: {method_name}",
+            "template_content": delta.template,
+            "success_rate": success_rate,
+            "avg_confidence": new_avg_confidence,
+            "total_uses": total_uses,
+            "successful_uses": successful_uses,
+            "last_used": now,
+            "effectiveness_score": effectiveness_score,
+            "vulnerability_types": sorted(vuln_types)
+        })
+
+def flush_findings() -> bool:
+    """Merge queued profile/method deltas and flush all buffered writes."""
+    with _delta_lock:
+        profile_deltas, method_deltas = dict(_profile_deltas), dict(_method_deltas)
+        _profile_deltas.clear()
+        _method_deltas.clear()
+    now = datetime.datetime.now()
+    if profile_deltas:
+        _flush_profile_deltas(profile_deltas, now)
+    if method_deltas:
+        _flush_method_deltas(method_deltas, now)
+    flushed = db.flush_all()
+    # New rows are visible now; drop memoized reads so the next call sees them.
+    for cache in _read_caches:
+        cache.clear()
+    _profile_cache.clear()
+    return flushed
+
+# The flush timer is a daemon thread and dies unrun at interpreter
+# shutdown, so a short-lived process that stored one finding would exit
+# with the row still buffered. Drain rows and pending deltas on exit;
+# nothing in the tree calls ClickHouseDatabase.close() for us.
+atexit.register(flush_findings)
+
+# attack_config keys already stored as dedicated attack_findings columns;
+# only anything beyond these is worth serializing into attack_metadata.
+_KNOWN_CONFIG_KEYS = frozenset({"type", "jailbreak", "seed_prompt", "prompt"})
+
+def _dump_metadata(attack_config: Dict[str, Any]) -> str:
+    """Serialize only the non-column leftovers of an attack config.
+
+    The common case — a config holding nothing but the known keys —
+    returns an empty string and skips JSON encoding entirely.
+    """
+    extras = {k: v for k, v in attack_config.items() if k not in _KNOWN_CONFIG_KEYS}
+    if not extras:
+        return ""
+    if orjson is not None:
+        return orjson.dumps(extras).decode("utf-8")
+    return json.dumps(extras, separators=(',', ':'))
+
 def store_attack_finding(website_url: str, attack_result: Dict[str, Any]) -> str:
     """
     Store comprehensive attack finding in ClickHouse database.
@@ -29,9 +297,13 @@ def store_attack_finding(website_url: str, attack_result: Dict[str, Any]) -> str
         attack_config = attack_result.get("attack_config", {})
         vulnerability_analysis = attack_result.get("vulnerability_analysis", {})
         chatbot_response = attack_result.get("chatbot_response", "")
-        
+
+        # One clock read per finding; every derived row reuses it.
+        now = datetime.datetime.now()
+
         # Prepare finding data for database
         finding_data = {
+            "timestamp": now,
             "website_url": website_url,
             "attack_type": attack_config.get("type", "unknown"),
             "jailbreak_name": attack_config.get("jailbreak", ""),
@@ -46,12 +318,13 @@ def store_attack_finding(website_url: str, attack_result: Dict[str, Any]) -> str
             "snippet": vulnerability_analysis.get("snippet", ""),
             "response_length": len(chatbot_response),
             "execution_time_ms": attack_result.get("execution_time_ms", 0),
-            "attack_metadata": json.dumps(attack_config)
+            "attack_metadata": _dump_metadata(attack_config)
         }
         
-        # Store in database
+        # Buffer for the next batched insert
         success = db.store_attack_finding(finding_data)
-        
+        _schedule_flush()
+
         if success:
             # Update website profile
             update_website_profile(website_url, attack_result)
@@ -66,6 +339,29 @@ def store_attack_finding(website_url: str, attack_result: Dict[str, Any]) -> str
     except Exception as e:
         return f"Error storing attack finding: {str(e)}"
 
+def store_attack_findings(website_url: str, attack_results: List[Dict[str, Any]]) -> str:
+    """
+    Store a batch of attack findings from one attack phase.
+
+    All rows join the same buffered insert block and the whole batch's
+    profile/method deltas merge before a single background flush, so an
+    attack phase costs one ClickHouse round trip rather than one per
+    finding.
+
+    Args:
+        website_url: Target website URL
+        attack_results: Attack results with vulnerability analysis
+
+    Returns:
+        Status message with the number of findings stored
+    """
+    stored = 0
+    for attack_result in attack_results:
+        if store_attack_finding(website_url, attack_result).startswith("Attack finding stored"):
+            stored += 1
+    flush_findings_async()
+    return f"Stored {stored}/{len(attack_results)} attack findings"
+
 def update_website_profile(website_url: str, attack_result: Dict[str, Any]) -> str:
     """
     Update website profile with new attack data.
@@ -78,62 +374,25 @@ def update_website_profile(website_url: str, attack_result: Dict[str, Any]) -> s
         Status message
     """
     try:
-        # Get existing profile data
-        existing_profile = get_website_profile(website_url)
-        
-        # Calculate new values
         vulnerability_analysis = attack_result.get("vulnerability_analysis", {})
         is_successful = vulnerability_analysis.get("success", False)
-        
-        # Update counters
-        total_attacks = existing_profile.get("total_attacks", 0) + 1
-        successful_attacks = existing_profile.get("successful_attacks", 0) + (1 if is_successful else 0)
-        
-        # Update vulnerability types
-        vuln_types = existing_profile.get("vulnerability_types", [])
-        if is_successful:
-            new_vuln_type = vulnerability_analysis.get("category", "UNKNOWN")
-            if new_vuln_type not in vuln_types:
-                vuln_types.append(new_vuln_type)
-        
-        # Update response patterns
-        response_patterns = existing_profile.get("common_response_patterns", [])
         chatbot_response = attack_result.get("chatbot_response", "")
-        if chatbot_response:
-            response_start = chatbot_response[:100]
-            if response_start not in response_patterns:
-                response_patterns.append(response_start)
-        
-        # Determine risk level
-        risk_level = "LOW"
-        if successful_attacks > 0:
-            success_rate = successful_attacks / total_attacks
-            if success_rate > 0.7:
-                risk_level = "HIGH"
-            elif success_rate > 0.3:
-                risk_level = "MEDIUM"
-        
-        # Prepare website data
-        website_data = {
-            "website_url": website_url,
-            "first_seen": existing_profile.get("first_seen", datetime.datetime.now()),
-            "last_attacked": datetime.datetime.now(),
-            "total_attacks": total_attacks,
-            "successful_attacks": successful_attacks,
-            "vulnerability_types": vuln_types,
-            "common_response_patterns": response_patterns,
-            "defense_mechanisms": existing_profile.get("defense_mechanisms", []),
-            "attack_success_patterns": existing_profile.get("attack_success_patterns", []),
-            "risk_level": risk_level,
-            "profile_metadata": json.dumps({
-                "last_updated": datetime.datetime.now().isoformat(),
-                "success_rate": success_rate if total_attacks > 0 else 0
-            })
-        }
-        
-        success = db.update_website_profile(website_data)
-        return "Website profile updated" if success else "Failed to update website profile"
-        
+
+        # Accumulate into the per-URL delta; the merged row is written at
+        # the next flush instead of one read-modify-write per attack.
+        with _delta_lock:
+            delta = _profile_deltas.setdefault(website_url, _ProfileDelta())
+            delta.attacks += 1
+            if is_successful:
+                delta.successes += 1
+                delta.vuln_types.add(vulnerability_analysis.get("category", "UNKNOWN"))
+            if chatbot_response:
+                prefix = chatbot_response[:100]
+                delta.response_patterns.setdefault(_prefix_hash(prefix), prefix)
+
+        _schedule_flush()
+        return "Website profile updated"
+
     except Exception as e:
         return f"Error updating website profile: {str(e)}"
 
@@ -149,55 +408,27 @@ def update_attack_method_effectiveness(attack_config: Dict[str, Any], vulnerabil
         Status message
     """
     try:
-        # Get existing method data
         method_name = attack_config.get("type", "unknown")
         method_type = "jailbreak" if attack_config.get("jailbreak") else "seed_prompt" if attack_config.get("seed_prompt") else "custom"
-        
-        existing_methods = db.get_attack_method_effectiveness(method_name, method_type)
-        existing_method = existing_methods[0] if existing_methods else {}
-        
-        # Calculate new effectiveness metrics
+
         is_successful = vulnerability_analysis.get("success", False)
         confidence = vulnerability_analysis.get("confidence", 0.0)
-        
-        total_uses = existing_method.get("total_uses", 0) + 1
-        successful_uses = existing_method.get("successful_uses", 0) + (1 if is_successful else 0)
-        success_rate = successful_uses / total_uses if total_uses > 0 else 0
-        
-        # Calculate average confidence
-        current_avg_confidence = existing_method.get("avg_confidence", 0.0)
-        current_total = existing_method.get("total_uses", 0)
-        new_avg_confidence = ((current_avg_confidence * current_total) + confidence) / total_uses
-        
-        # Calculate effectiveness score (combination of success rate and confidence)
-        effectiveness_score = (success_rate * 0.7) + (new_avg_confidence * 0.3)
-        
-        # Update vulnerability types
-        vuln_types = existing_method.get("vulnerability_types", [])
-        if is_successful:
-            new_vuln_type = vulnerability_analysis.get("category", "UNKNOWN")
-            if new_vuln_type not in vuln_types:
-                vuln_types.append(new_vuln_type)
-        
-        # Prepare method data
-        method_data = {
-            "method_name": method_name,
-            "method_type": method_type,
-            "category": attack_config.get("jailbreak", attack_config.get("seed_prompt", "custom")),
-            "description": f"Attack method: {method_name}",
-            "template_content": attack_config.get("prompt", ""),
-            "success_rate": success_rate,
-            "avg_confidence": new_avg_confidence,
-            "total_uses": total_uses,
-            "successful_uses": successful_uses,
-            "last_used": datetime.datetime.now(),
-            "effectiveness_score": effectiveness_score,
-            "vulnerability_types": vuln_types
-        }
-        
-        success = db.store_attack_method(method_data)
-        return "Attack method effectiveness updated" if success else "Failed to update method effectiveness"
-        
+
+        # Accumulate into the per-method delta; running averages and the
+        # effectiveness score are recomputed once per flush from totals.
+        with _delta_lock:
+            delta = _method_deltas.setdefault((method_name, method_type), _MethodDelta())
+            delta.uses += 1
+            delta.confidence_sum += confidence
+            if is_successful:
+                delta.successes += 1
+                delta.vuln_types.add(vulnerability_analysis.get("category", "UNKNOWN"))
+            delta.category = attack_config.get("jailbreak", attack_config.get("seed_prompt", "custom"))
+            delta.template = attack_config.get("prompt", "")
+
+        _schedule_flush()
+        return "Attack method effectiveness updated"
+
     except Exception as e:
         return f"Error updating attack method effectiveness: {str(e)}"
 
@@ -211,21 +442,46 @@ def get_website_profile(website_url: str) -> Dict[str, Any]:
     Returns:
         Website profile data
     """
-    try:
-        # This would typically query the database, but for now return default
-        return {
-            "website_url": website_url,
-            "total_attacks": 0,
-            "successful_attacks": 0,
-            "vulnerability_types": [],
-            "common_response_patterns": [],
-            "defense_mechanisms": [],
-            "attack_success_patterns": [],
-            "risk_level": "UNKNOWN"
-        }
-    except Exception as e:
-        return {"error": str(e)}
+    now = time.monotonic()
+    cached = _profile_cache.get(website_url)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    profile = {
+        "website_url": website_url,
+        "total_attacks": 0,
+        "successful_attacks": 0,
+        "vulnerability_types": [],
+        "common_response_patterns": [],
+        "defense_mechanisms": [],
+        "attack_success_patterns": [],
+        "risk_level": "UNKNOWN"
+    }
+    if db.client:
+        try:
+            # Point lookup on the website_profiles primary key; tuple rows
+            # skip per-row column-name mapping.
+            result = db.client.query("""
+                SELECT total_attacks, successful_attacks, vulnerability_types,
+                       common_response_patterns, defense_mechanisms,
+                       attack_success_patterns, risk_level, first_seen
+                FROM website_profiles
+                WHERE website_url = %(url)s
+                ORDER BY updated_at DESC
+                LIMIT 1
+            """, parameters={"url": website_url})
+            if result.result_rows:
+                (profile["total_attacks"], profile["successful_attacks"],
+                 profile["vulnerability_types"], profile["common_response_patterns"],
+                 profile["defense_mechanisms"], profile["attack_success_patterns"],
+                 profile["risk_level"], profile["first_seen"]) = result.result_rows[0]
+        except Exception as e:
+            return {"error": str(e)}
 
+    _profile_cache[website_url] = (now + _PROFILE_TTL, profile)
+    return profile
+
+@_ttl_cache(ttl=30)
 def get_adaptive_attack_recommendations(website_url: str, target_vulnerability_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """
     Get adaptive attack recommendations based on historical data.
@@ -261,6 +517,7 @@ def get_adaptive_attack_recommendations(website_url: str, target_vulnerability_t
     except Exception as e:
         return [{"error": f"Failed to get recommendations: {str(e)}"}]
 
+@_ttl_cache(ttl=30)
 def get_ineffective_attacks_for_website(website_url: str) -> List[Dict[str, Any]]:
     """
     Get attacks that were ineffective for a specific website.
@@ -291,6 +548,7 @@ def get_ineffective_attacks_for_website(website_url: str) -> List[Dict[str, Any]
     except Exception as e:
         return [{"error": f"Failed to get ineffective attacks: {str(e)}"}]
 
+@_ttl_cache(ttl=30)
 def get_attack_statistics(website_url: Optional[str] = None, days_back: int = 30) -> Dict[str, Any]:
     """
     Get comprehensive attack statistics.
@@ -308,6 +566,7 @@ def get_attack_statistics(website_url: Optional[str] = None, days_back: int = 30
     except Exception as e:
         return {"error": f"Failed to get statistics: {str(e)}"}
 
+@_ttl_cache(ttl=30)
 def get_website_vulnerability_patterns(website_url: str) -> Dict[str, Any]:
     """
     Get vulnerability patterns for a specific website.
@@ -352,14 +611,19 @@ def generate_adaptive_attack_plan(website_url: str, target_vulnerability_types:
         Comprehensive attack plan
     """
     try:
-        # Get effective attacks
-        effective_attacks = get_adaptive_attack_recommendations(website_url, target_vulnerability_types)
-        
-        # Get ineffective attacks to avoid
-        ineffective_attacks = get_ineffective_attacks_for_website(website_url)
-        
-        # Get vulnerability patterns
-        patterns = get_website_vulnerability_patterns(website_url)
+        # The three lookups are independent round trips; run them
+        # concurrently so the plan costs max-of-three instead of the sum.
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            effective_future = executor.submit(
+                get_adaptive_attack_recommendations, website_url, target_vulnerability_types)
+            ineffective_future = executor.submit(
+                get_ineffective_attacks_for_website, website_url)
+            patterns_future = executor.submit(
+                get_website_vulnerability_patterns, website_url)
+
+            effective_attacks = effective_future.result()
+            ineffective_attacks = ineffective_future.result()
+            patterns = patterns_future.result()
         
         # Generate attack plan
         plan = {
@@ -389,21 +653,23 @@ def analyze_attack_effectiveness_trends(website_url: Optional[str] = None, days_
         Effectiveness trends analysis
     """
     try:
-        stats = get_attack_statistics(website_url, days_back)
-        
-        # Calculate trends
-        total_attacks = stats.get("total_attacks", 0)
-        successful_attacks = stats.get("successful_attacks", 0)
+        # One aggregate query; ClickHouse does all the counting so the
+        # Python side never sees per-attack breakdown rows.
+        summary = db.get_trend_summary(website_url, days_back)
+
+        total_attacks = summary.get("total_attacks", 0)
+        successful_attacks = summary.get("successful_attacks", 0)
         success_rate = successful_attacks / total_attacks if total_attacks > 0 else 0
-        
-        # Analyze vulnerability trends
-        vuln_breakdown = stats.get("vulnerability_breakdown", [])
-        most_common_vuln = vuln_breakdown[0] if vuln_breakdown else {}
-        
-        # Analyze attack effectiveness
-        attack_effectiveness = stats.get("attack_effectiveness", [])
-        most_effective_attack = attack_effectiveness[0] if attack_effectiveness else {}
-        
+
+        top_vulns = summary.get("top_vulnerabilities") or []
+        most_common_vuln = {"vulnerability_type": top_vulns[0]} if top_vulns else {}
+
+        most_effective = summary.get("most_effective_attack")
+        most_effective_attack = {
+            "attack_type": most_effective,
+            "success_rate": summary.get("most_effective_success_rate", 0)
+        } if most_effective else {}
+
         trends = {
             "overall_success_rate": success_rate,
             "total_attacks_analyzed": total_attacks,
@@ -412,12 +678,12 @@ def analyze_attack_effectiveness_trends(website_url: Optional[str] = None, days_
             "analysis_period_days": days_back,
             "trend_analysis": {
                 "high_success_rate": success_rate > 0.5,
-                "diverse_vulnerabilities": len(vuln_breakdown) > 3,
-                "consistent_effectiveness": len(attack_effectiveness) > 0
+                "diverse_vulnerabilities": summary.get("vulnerability_diversity", 0) > 3,
+                "consistent_effectiveness": summary.get("attack_type_count", 0) > 0
             }
         }
-        
+
         return trends
-        
+
     except Exception as e:
         return {"error": f"Failed to analyze trends: {str(e)}"}
@@ -4,15 +4,98 @@ DeepL translation integration for RedBot.
 Translates security findings and remediation plans to multiple languages.
 """
 import os
+import hashlib
+import threading
+from typing import Optional
+
 import deepl
 from dotenv import load_dotenv
 
+from database_schema import db
+
 # Load environment variables
 load_dotenv()
 
 # Initialize DeepL client
 DEEPL_API_KEY = os.getenv("DEEPL_API_KEY")
 
+# Lazily constructed shared client; building deepl.Translator per call
+# repeats TLS/session setup for every translated string.
+_translator: Optional[deepl.Translator] = None
+_translator_lock = threading.Lock()
+
+def _get_translator() -> deepl.Translator:
+    """Return the shared DeepL client, creating it on first use."""
+    global _translator
+    if _translator is None:
+        with _translator_lock:
+            if _translator is None:
+                _translator = deepl.Translator(DEEPL_API_KEY)
+    return _translator
+
+# Shared memo of finished translations keyed by (text, target_lang);
+# a plain dict with FIFO eviction so the batch path can probe it too.
+_CACHE_MAX = 4096
+_cache_lock = threading.Lock()
+_translation_cache: dict = {}
+
+def _text_hash(text: str) -> bytes:
+    """16-byte content key for the persistent translations table."""
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+def _cache_put(text: str, target_lang: str, translated: str):
+    if len(_translation_cache) >= _CACHE_MAX:
+        _translation_cache.pop(next(iter(_translation_cache)))
+    _translation_cache[(text, target_lang)] = translated
+
+def _translate_many(texts: list, target_lang: str) -> list:
+    """Translate a list of strings in one API round trip.
+
+    Cache hits and duplicates are resolved locally; only distinct unseen
+    strings are sent, as a single list-input translate_text call.
+    """
+    out = [None] * len(texts)
+    missing = []
+    with _cache_lock:
+        for i, text in enumerate(texts):
+            if not text:
+                out[i] = text
+            else:
+                cached = _translation_cache.get((text, target_lang))
+                if cached is None:
+                    missing.append(i)
+                else:
+                    out[i] = cached
+    if missing:
+        unique = list(dict.fromkeys(texts[i] for i in missing))
+        translated = {}
+
+        # Second tier: previously stored translations in ClickHouse, one
+        # lookup for the whole batch keyed by content hash.
+        hashes = {src: _text_hash(src) for src in unique}
+        stored = db.get_translations(list(hashes.values()), target_lang)
+        for src, h in hashes.items():
+            if h in stored:
+                translated[src] = stored[h]
+
+        unseen = [src for src in unique if src not in translated]
+        if unseen:
+            results = _get_translator().translate_text(unseen, target_lang=target_lang)
+            for src, result in zip(unseen, results):
+                translated[src] = result.text
+                db.store_translation(hashes[src], target_lang, src, result.text)
+
+        with _cache_lock:
+            for src, text in translated.items():
+                _cache_put(src, target_lang, text)
+        for i in missing:
+            out[i] = translated[texts[i]]
+    return out
+
+def _translate_cached(text: str, target_lang: str) -> str:
+    """Translate one string, memoizing repeats of canonical snippets."""
+    return _translate_many([text], target_lang)[0]
+
 def translate_finding(finding: dict, target_lang: str = "ES") -> dict:
     """
     Translate a vulnerability finding to target language.
@@ -28,13 +111,8 @@ def translate_finding(finding: dict, target_lang: str = "ES") -> dict:
         return {"error": "DeepL API key not configured"}
     
     try:
-        translator = deepl.Translator(DEEPL_API_KEY)
-        
         # Translate the snippet
-        translated_snippet = translator.translate_text(
-            finding.get('snippet', ''),
-            target_lang=target_lang
-        ).text
+        translated_snippet = _translate_cached(finding.get('snippet', ''), target_lang)
         
         # Return translated finding
         return {
@@ -49,6 +127,29 @@ def translate_finding(finding: dict, target_lang: str = "ES") -> dict:
     except Exception as e:
         return {"error": f"Translation failed: {e}"}
 
+def translate_findings(findings: list, target_lang: str = "ES") -> list:
+    """Translate many findings with one batched snippet request."""
+    if not DEEPL_API_KEY:
+        return [{"error": "DeepL API key not configured"} for _ in findings]
+
+    try:
+        snippets = [finding.get('snippet', '') for finding in findings]
+        translated = _translate_many(snippets, target_lang)
+        return [
+            {
+                "category": finding['category'],
+                "severity": finding['severity'],
+                "success": finding['success'],
+                "confidence": finding['confidence'],
+                "snippet": snippet,
+                "snippet_original": finding.get('snippet', ''),
+                "language": target_lang
+            }
+            for finding, snippet in zip(findings, translated)
+        ]
+    except Exception as e:
+        return [{"error": f"Translation failed: {e}"} for _ in findings]
+
 def translate_plan(plan: dict, target_lang: str = "ES") -> dict:
     """
     Translate a remediation plan to target language.
@@ -64,31 +165,18 @@ def translate_plan(plan: dict, target_lang: str = "ES") -> dict:
         return {"error": "DeepL API key not configured"}
     
     try:
-        translator = deepl.Translator(DEEPL_API_KEY)
-        
-        # Translate steps
-        translated_steps = []
-        for step in plan['engineer_plan']['steps']:
-            translated = translator.translate_text(step, target_lang=target_lang).text
-            translated_steps.append(translated)
-        
-        # Translate acceptance tests
-        translated_tests = []
-        for test in plan['engineer_plan']['acceptance_tests']:
-            translated = translator.translate_text(test, target_lang=target_lang).text
-            translated_tests.append(translated)
-        
-        # Translate rollback
-        translated_rollback = translator.translate_text(
-            plan['engineer_plan']['rollback'],
-            target_lang=target_lang
-        ).text
-        
-        # Translate KPI
-        translated_kpi = translator.translate_text(
-            plan['exec_summary']['kpi'],
-            target_lang=target_lang
-        ).text
+        # One API round trip for the whole plan: steps, acceptance tests,
+        # rollback and KPI ride in a single list-input translate_text call.
+        steps = plan['engineer_plan']['steps']
+        tests = plan['engineer_plan']['acceptance_tests']
+        payloads = steps + tests + [plan['engineer_plan']['rollback'],
+                                    plan['exec_summary']['kpi']]
+        results = _translate_many(payloads, target_lang)
+
+        translated_steps = results[:len(steps)]
+        translated_tests = results[len(steps):len(steps) + len(tests)]
+        translated_rollback = results[-2]
+        translated_kpi = results[-1]
         
         # Build translated plan
         return {
@@ -123,8 +211,7 @@ def get_available_languages():
         return []
     
     try:
-        translator = deepl.Translator(DEEPL_API_KEY)
-        languages = translator.get_target_languages()
+        languages = _get_translator().get_target_languages()
         return [(lang.code, lang.name) for lang in languages]
     except:
         # Fallback to common languages
@@ -1,7 +1,10 @@
 import os
 import re
+import atexit
+import threading
 import requests
 import datetime as dt
+from collections import deque
 from typing import Dict, List, Any, Optional
 import clickhouse_connect
 
@@ -15,7 +18,7 @@ EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 
 # Import the attack agent for comprehensive testing
 from openhands_attack_agent import OpenHandsAttackAgent
-from attack_loader import AttackLoader
+from attack_loader import AttackLoader, get_attack_loader
 from database_tools import (
     store_attack_finding, update_website_profile, get_adaptive_attack_recommendations,
     get_ineffective_attacks_for_website, get_attack_statistics, get_website_vulnerability_patterns,
@@ -80,9 +83,59 @@ def build_plan(vuln: dict) -> dict:
       "roi": {"risk_reduced_per_hour": roi}
     }
 
+# Rows are buffered per table and shipped through client.insert so
+# clickhouse-connect serializes the values natively: one batched insert
+# amortizes the per-statement round trip MergeTree penalizes, and no
+# value (e.g. a finding snippet) is ever interpolated into SQL text.
+# Tuples are positional, matching the bare VALUES lists used before.
+_INSERT_FLUSH_ROWS = 10_000
+_INSERT_FLUSH_SECONDS = 1.0
+_insert_buffers: Dict[str, deque] = {}
+_insert_lock = threading.Lock()
+_insert_timer: Optional[threading.Timer] = None
+
+def _buffer_insert(table: str, row: tuple):
+    """Queue one row; flush on size, or via a short timer otherwise."""
+    global _insert_timer
+    with _insert_lock:
+        buf = _insert_buffers.setdefault(table, deque())
+        buf.append(row)
+        full = len(buf) >= _INSERT_FLUSH_ROWS
+        if _insert_timer is None and not full:
+            _insert_timer = threading.Timer(_INSERT_FLUSH_SECONDS, flush_inserts)
+            _insert_timer.daemon = True
+            _insert_timer.start()
+    if full:
+        flush_inserts()
+
+def flush_inserts():
+    """Push all buffered rows to ClickHouse, one insert per table."""
+    global _insert_timer
+    with _insert_lock:
+        if _insert_timer is not None:
+            _insert_timer.cancel()
+            _insert_timer = None
+        pending = [(table, list(buf)) for table, buf in _insert_buffers.items() if buf]
+        for table, _ in pending:
+            _insert_buffers[table].clear()
+    if client is None:
+        return
+    for table, rows in pending:
+        try:
+            client.insert(table, rows)
+        except Exception as e:
+            print(f"Warning: ClickHouse insert into {table} failed: {e}")
+
+# The flush timer is a daemon thread and gets killed at interpreter
+# shutdown without running; drain whatever it hasn't shipped yet so a
+# short-lived process (e.g. the POC flow) still persists its rows.
+atexit.register(flush_inserts)
+
 def persist_clickhouse(vuln: dict, plan: dict) -> str:
-    client.command(f"INSERT INTO findings VALUES (now(), '{vuln['category']}', '{vuln['severity']}', {1 if vuln['success'] else 0})")
-    client.command(f"INSERT INTO plans    VALUES (now(), '{vuln['category']}', {plan['engineer_plan']['eta_hours']}, {plan['engineer_plan']['cost_hours']}, {plan['roi']['risk_reduced_per_hour']})")
+    now = dt.datetime.now()
+    _buffer_insert("findings", (now, vuln['category'], vuln['severity'], 1 if vuln['success'] else 0))
+    _buffer_insert("plans", (now, vuln['category'], plan['engineer_plan']['eta_hours'],
+                             plan['engineer_plan']['cost_hours'], plan['roi']['risk_reduced_per_hour']))
     return "ok"
 
 def notify_comment(vuln: dict, plan: dict) -> str:
@@ -168,28 +221,28 @@ def persist_comprehensive_findings(vulnerability_report: dict, remediation_plans
     """
     try:
         if os.getenv("CH_HOST"):
+            now = dt.datetime.now()
             # Store detailed vulnerability data
             for finding in vulnerability_report.get("high_severity_findings", []):
-                client.command(f"""
-                    INSERT INTO comprehensive_findings VALUES (
-                        now(), 
-                        '{finding.get('attack_type', 'unknown')}', 
-                        '{finding.get('severity', 'unknown')}', 
-                        {finding.get('confidence', 0)}, 
-                        '{finding.get('snippet', '')}'
-                    )
-                """)
-            
+                _buffer_insert("comprehensive_findings", (
+                    now,
+                    finding.get('attack_type', 'unknown'),
+                    finding.get('severity', 'unknown'),
+                    finding.get('confidence', 0),
+                    finding.get('snippet', '')
+                ))
+
             # Store attack effectiveness data
-            client.command(f"""
-                INSERT INTO attack_effectiveness VALUES (
-                    now(),
-                    {vulnerability_report.get('total_attacks_executed', 0)},
-                    {vulnerability_report.get('total_vulnerabilities', 0)},
-                    {vulnerability_report.get('success_rate', 0)}
-                )
-            """)
-        
+            _buffer_insert("attack_effectiveness", (
+                now,
+                vulnerability_report.get('total_attacks_executed', 0),
+                vulnerability_report.get('total_vulnerabilities', 0),
+                vulnerability_report.get('success_rate', 0)
+            ))
+
+            # End of an attack cycle: ship everything in one pass.
+            flush_inserts()
+
         return "persistence_successful"
     except Exception as e:
         return f"persistence_failed: {str(e)}"
@@ -251,7 +304,7 @@ def attack_method_catalog() -> dict:
     Provide catalog of all available attack methods for OpenHands planning.
     Returns comprehensive list of jailbreaks and seed prompts with metadata.
     """
-    loader = AttackLoader()
+    loader = get_attack_loader()
     
     jailbreaks = loader.get_all_jailbreak_attacks()
     seed_attacks = loader.get_all_seed_attacks()
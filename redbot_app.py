@@ -6,7 +6,7 @@ import streamlit as st
 import deepl
 from dotenv import load_dotenv
 
-from attack_loader import AttackLoader
+from attack_loader import AttackLoader, get_attack_loader
 from openhands_tools import run_comprehensive_attack_cycle
 
 # Load environment variables from .env file
@@ -135,7 +135,7 @@ def translate_plan(plan_data: dict, target_lang: str) -> dict:
 @st.cache_resource
 def load_attack_system():
     """Load the attack system once and cache it."""
-    return AttackLoader()
+    return get_attack_loader()
 
 # --------- Enhanced Attack System ---------
 def direct_attack_and_capture(target_url: str, attack_config: dict) -> dict: